@@ -7,53 +7,317 @@ Detecta novas postagens em subreddits específicos e envia formatadas para um gr
 
 import praw
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import signal
+import random
 import json
 import os
 import sys
+import shutil
 import tempfile
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Optional
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
 import re
+import functools
+import atexit
+import threading
+
+try:
+    import orjson  # Opcional: (de)serialização bem mais rápida dos arquivos de estado
+except ImportError:
+    orjson = None
 
 # Configuração de logging com suporte a UTF-8
+# Os registros passam por uma fila e são gravados em arquivo/console por uma thread
+# separada, para que envios e downloads não fiquem esperando pelo disco. SimpleQueue
+# porque os handlers de sinal também logam e o put dela é reentrante (o do Queue trava)
+_log_queue = queue.SimpleQueue()
+# LOG_LEVEL desconhecido (ex.: "verbose") volta para INFO em vez de quebrar o import
+_log_level_name = (os.environ.get('LOG_LEVEL') or 'INFO').upper()
+_log_level = logging.getLevelName(_log_level_name)
+_log_level_valid = isinstance(_log_level, int)
+if not _log_level_valid:
+    _log_level = logging.INFO
 logging.basicConfig(
-    level=logging.INFO,
+    level=_log_level,
     format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('reddit_bot.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(_log_queue)]
+)
+_log_listener = QueueListener(
+    _log_queue,
+    logging.FileHandler('reddit_bot.log', encoding='utf-8'),
+    logging.StreamHandler()
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
+if not _log_level_valid:
+    logger.warning(f"LOG_LEVEL inválido: {_log_level_name}. Usando INFO")
 
 # Configuração de encoding UTF-8 para Windows
 if sys.platform == 'win32':
-    import os
-    # Configura variáveis de ambiente para UTF-8
-    os.environ['PYTHONIOENCODING'] = 'utf-8'
-    # Tenta configurar o console para UTF-8 se possível
-    try:
-        import locale
-        locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
-    except:
-        pass
+    # Reconfigura o console diretamente (Python 3.7+), sem depender do locale; caracteres
+    # que o console não consiga exibir viram '?' em vez de gerar UnicodeEncodeError
+    for _stream in (sys.stdout, sys.stderr):
+        try:
+            _stream.reconfigure(encoding='utf-8', errors='replace')
+        except AttributeError:
+            pass
+
+# Status HTTP do Telegram considerados transitórios (vale a pena tentar de novo)
+TELEGRAM_RETRY_STATUSES = {429, 500, 502, 503, 504}
+TELEGRAM_MAX_ATTEMPTS = 5
+TELEGRAM_MAX_BACKOFF = 15  # segundos
+# Timeouts (conexão, leitura) separados: a conexão falha rápido, o upload pode demorar
+TELEGRAM_TIMEOUT = (10, 30)
+TELEGRAM_UPLOAD_TIMEOUT = (10, 120)
+DOWNLOAD_TIMEOUT = (10, 60)
+# Pool da sessão HTTP: Telegram, i.redd.it, v.redd.it, preview.redd.it e hosts externos
+HTTP_POOL_HOSTS = 16  # hosts com pool próprio
+HTTP_POOL_MAXSIZE = 32  # conexões keep-alive mantidas por host
+MAX_FETCH_WORKERS = 8  # subreddits consultados em paralelo
+MEDIA_CACHE_SIZE = 1024  # análises de mídia mantidas em memória (por post.id)
+MEDIA_GROUP_MAX = 10  # limite de itens do sendMediaGroup
+# Limites do Telegram: ~30 mensagens/s no total e ~20 mensagens/min por grupo
+TELEGRAM_GLOBAL_RATE = (29, 1)   # (mensagens, segundos)
+TELEGRAM_CHAT_RATE = (19, 60)
+
+# Preflight das imagens enviadas por URL (o Telegram baixa a foto do host de origem)
+PREFLIGHT_TIMEOUT = (5, 10)
+PHOTO_URL_MAX_BYTES = 5 * 1024 * 1024  # limite do sendPhoto por URL
+TELEGRAM_FETCHER_USER_AGENT = 'TelegramBot (like TwitterBot)'
+HOST_FAILURE_LIMIT = 3  # falhas no período abaixo para desistir do host
+HOST_FAILURE_WINDOW = 3600  # segundos
+HOST_OK_TTL = 600  # segundos em que um host aprovado no preflight dispensa novos HEADs
+# Erro do Telegram que indica que ele não conseguiu baixar a mídia do host de origem
+TELEGRAM_FETCH_ERROR = 'failed to get http url content'
+
+# Persistência dos posts processados: snapshot JSON + log append-only dos IDs novos
+PROCESSED_POSTS_FILE = 'processed_posts.json'
+PROCESSED_POSTS_LOG = 'processed_posts.log'
+PROCESSED_COMPACT_EVERY = 1000  # entradas no log antes de compactar no snapshot
+PROCESSED_MAX_HISTORY = 50000  # IDs mais recentes mantidos; os mais antigos já saíram do /new
+
+# Último post visto por subreddit, usado como âncora (before=) para buscar só o que é novo
+LAST_SEEN_FILE = 'last_seen.json'
+LAST_SEEN_REANCHOR_INTERVAL = 1800  # segundos; uma busca completa recupera âncoras de posts removidos
+LISTING_MAX_LIMIT = 100  # máximo de posts que o Reddit devolve por requisição
+
+# Intervalo para gravar failed_messages.json quando houver alterações pendentes
+FAILED_FLUSH_INTERVAL = 10  # segundos
+# Reenvio das mensagens falhadas em thread própria, com backoff exponencial por mensagem
+FAILED_RETRY_INTERVAL = 30  # segundos entre verificações de mensagens vencidas
+FAILED_RETRY_BASE_DELAY = 60  # espera antes da primeira tentativa, dobrada a cada falha
+FAILED_RETRY_MAX_DELAY = 3600
+FAILED_RETRY_MAX_ATTEMPTS = 3
+
+# Intervalo adaptativo: cresce quando não há posts novos e encolhe quando há atividade
+INTERVAL_BACKOFF_FACTOR = 1.5
+INTERVAL_JITTER = 0.1  # fração do intervalo somada aleatoriamente a cada espera
+
+# Reconexão do modo stream após erros do Reddit (5xx, timeouts), com backoff exponencial
+STREAM_RETRY_BASE_DELAY = 5  # segundos
+STREAM_RETRY_MAX_DELAY = 300
+
+# Tamanho do buffer usado para gravar downloads de vídeo no disco
+DOWNLOAD_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+def read_json_file(path: str):
+    """Lê um arquivo JSON (usa orjson quando instalado)"""
+    if orjson:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_json_file(path: str, data, indent: bool = False):
+    """Grava um arquivo JSON em UTF-8 de forma atômica (usa orjson quando instalado)"""
+    if orjson:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    else:
+        content = json.dumps(data, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+    
+    # Grava num arquivo temporário, força para o disco e troca de uma vez: uma queda no
+    # meio nunca deixa o arquivo truncado (fica a versão antiga ou a nova, inteira)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+# Padrões e extensões usados na classificação dos posts (compilados uma única vez)
+# Nome da modelo: "Nome | resto do título". O nome vale se, sem dígitos, pontuação e
+# espaços, alguma palavra (separada por tab, NBSP e afins) começa com maiúscula e tem 2+ caracteres
+_MODEL_RE = re.compile(r'^([^|]+)\|')
+_MODEL_IGNORED = str.maketrans('', '', '0123456789@#$%^&*()_+=[]{};\'": ,.<>?/~`')
+_PHOTO_EXTS = ('.jpg', '.jpeg', '.png', '.gif')  # formatos enviados via sendPhoto
+_IMG_EXTS = _PHOTO_EXTS + ('.webp',)
+_VID_EXTS = ('.mp4', '.webm', '.mov')
+_YOUTUBE_DOMAINS = ('youtube.com', 'youtu.be')
+
+@functools.lru_cache(maxsize=2048)
+def _parse_url(url: str) -> urllib.parse.SplitResult:
+    """Faz o parse da URL (em minúsculas) uma única vez por URL"""
+    return urllib.parse.urlsplit(url.lower())
+
+def _host_matches(host: str, domain: str) -> bool:
+    """Verifica se o host é o domínio ou um subdomínio dele"""
+    return host == domain or host.endswith('.' + domain)
+
+def _classify_url(url: str) -> str:
+    """Classifica a URL de um post em 'image', 'video', 'youtube', 'gallery' ou 'link'"""
+    parts = _parse_url(url)
+    path = parts.path
+    host = parts.hostname or ''
+    
+    if path.endswith(_IMG_EXTS):
+        return 'image'
+    if path.endswith(_VID_EXTS) or host == 'v.redd.it':
+        return 'video'
+    if any(_host_matches(host, domain) for domain in _YOUTUBE_DOMAINS):
+        return 'youtube'
+    if _host_matches(host, 'reddit.com') and path.startswith('/gallery'):
+        return 'gallery'
+    return 'link'
+
+# Emoji de depuração para cada tipo retornado por _classify_url
+_URL_EMOJIS = {
+    'image': "🖼️",    # Imagem
+    'video': "🎬",    # Vídeo por extensão
+    'youtube': "📺",  # YouTube
+    'gallery': "🖼️",  # Galeria Reddit
+    'link': "🔗",     # Link genérico
+}
+
+@dataclass
+class MediaInfo:
+    """Mídia encontrada em um post: kind é 'video', 'image', 'link' ou 'none'"""
+    kind: str
+    image_url: Optional[str] = None
+    video_url: Optional[str] = None
+    image_urls: List[str] = field(default_factory=list)  # todas as imagens da galeria, em ordem
+
+@dataclass
+class PreparedPost:
+    """Post pronto para envio: mensagem formatada e mídia já resolvida/baixada"""
+    post: object
+    message: str = ''
+    media_url: Optional[str] = None
+    video_file_path: Optional[str] = None
+    post_url: Optional[str] = None
+    is_nsfw: bool = False
+    media_group: Optional[List[str]] = None
+    video_url: Optional[str] = None  # MP4 enviado pela URL (prefer_url_passthrough)
+    skip: bool = False
+
+class RateLimiter:
+    """Token bucket thread-safe: libera no máximo max_calls chamadas a cada period segundos"""
+    
+    def __init__(self, max_calls: int, period: float):
+        self.capacity = max_calls
+        self.rate = max_calls / period
+        self.tokens = float(max_calls)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, tokens: int = 1):
+        """Bloqueia até haver tokens disponíveis (nunca mais que a capacidade do bucket)"""
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
 
 class RedditToTelegramBot:
     def __init__(self, config_file='config.json'):
         """Inicializa o bot com configurações do arquivo JSON"""
+        self.config_file = config_file
         self.config = self.load_config(config_file)
         self.reddit = self.setup_reddit()
+        # O PRAW não é thread-safe: cada busca paralela usa um cliente próprio, reaproveitado
+        # entre os ciclos (no máximo MAX_FETCH_WORKERS clientes extras)
+        self._fetch_clients = queue.SimpleQueue()
+        self.apply_config()
+        self._media_cache = OrderedDict()
         self.processed_posts = self.load_processed_posts()
+        # Log aberto uma única vez; cada post novo custa apenas uma linha escrita
+        self._processed_log = open(PROCESSED_POSTS_LOG, 'a', encoding='utf-8')
+        self.last_seen = self.load_last_seen()
+        self._last_full_fetch = None  # time.monotonic() da última busca sem âncora
+        # Intervalo atual entre verificações, ajustado a cada ciclo por next_interval()
+        self.current_interval = self._check_interval
         self.failed_messages = self.load_failed_messages()
+        # Gravação de failed_messages.json é adiada e feita em lote pela thread de flush
+        self._failed_lock = threading.Lock()
+        self._failed_dirty = False
+        self._stop_event = threading.Event()
+        atexit.register(self.flush_failed_messages)
+        # Sessão HTTP compartilhada (keep-alive) para o Telegram e downloads de mídia
+        self.http = self.create_http_session()
+        # Preflight sem retry: um HEAD por imagem, e 429/5xx chegam como status (não RetryError)
+        self._preflight_http = self.create_http_session(retry=False)
+        # Máximo de envios simultâneos ao Telegram
+        self.max_concurrent_sends = 5
+        # Throttling proativo para não esbarrar nos limites do Telegram (evita 429)
+        self.global_limiter = RateLimiter(*TELEGRAM_GLOBAL_RATE)
+        self.chat_limiters = {}
+        self._limiters_lock = threading.Lock()
+        # Falhas recentes do Telegram ao buscar mídia, por host: {host: (falhas, último timestamp)}
+        self._host_failures = {}
+        # Hosts aprovados no preflight: {host: timestamp de expiração do veredito}
+        self._host_ok = {}
+        self._host_lock = threading.Lock()
+        # Threads de segundo plano só depois que tudo o que elas usam já existe
+        threading.Thread(target=self._flush_loop, name='failed-messages-flush', daemon=True).start()
+        # Reenvios rodam em segundo plano para não atrasar as verificações do Reddit
+        self._retry_thread = threading.Thread(target=self._retry_loop, name='failed-messages-retry', daemon=True)
+        self._retry_thread.start()
         
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def create_http_session(self, retry: bool = True) -> requests.Session:
+        """Cria a sessão HTTP com pool de conexões reutilizáveis"""
+        session = requests.Session()
+        # O Retry do urllib3 só repete métodos idempotentes (GET/HEAD, ex.: downloads);
+        # os POSTs ao Telegram têm retry próprio em _post_telegram
+        if retry:
+            retry = Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True
+            )
+        else:
+            retry = 0
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
     def load_config(self, config_file: str) -> Dict:
         """Carrega configurações do arquivo JSON"""
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return read_json_file(config_file)
         except FileNotFoundError:
             logger.error(f"Arquivo de configuração {config_file} não encontrado")
             self.create_sample_config(config_file)
@@ -62,6 +326,39 @@ class RedditToTelegramBot:
             logger.error(f"Erro ao decodificar JSON do arquivo {config_file}")
             raise
     
+    def apply_config(self):
+        """Pré-calcula os valores de configuração usados a cada post e a cada ciclo"""
+        telegram = self.config['telegram']
+        self._telegram_api = f"https://api.telegram.org/bot{telegram['bot_token']}/"
+        self._chat_id = telegram['chat_id']
+        self._subreddits = list(self.config['subreddits'])
+        self._max_posts = int(self.config.get('max_posts_per_check', 10))
+        self._send_text_only = bool(self.config.get('send_text_only_posts', False))
+        self._prefer_url_passthrough = bool(self.config.get('prefer_url_passthrough', True))
+        self._check_interval = self.config['check_interval']
+        self._min_interval = self.config.get('min_interval', self._check_interval)
+        self._max_interval = self.config.get('max_interval', self._check_interval * 4)
+        self.build_message_templates()
+    
+    def reload_config(self, signum=None, frame=None):
+        """Relê o config.json (SIGHUP) sem reiniciar o bot; credenciais do Reddit exigem reinício"""
+        try:
+            config = self.load_config(self.config_file)
+        except Exception as e:
+            logger.error(f"Erro ao recarregar configuração: {e}")
+            return
+        previous = self.config
+        self.config = config
+        try:
+            self.apply_config()
+        except Exception as e:
+            logger.error(f"Configuração inválida, mantendo a anterior: {e}")
+            self.config = previous
+            self.apply_config()
+            return
+        self.current_interval = min(max(self.current_interval, self._min_interval), self._max_interval)
+        logger.info(f"Configuração recarregada: {len(self._subreddits)} subreddits")
+    
     def create_sample_config(self, config_file: str):
         """Cria um arquivo de configuração de exemplo"""
         sample_config = {
@@ -80,9 +377,11 @@ class RedditToTelegramBot:
                 "technology"
             ],
             "check_interval": 300,
+            "min_interval": 120,
+            "max_interval": 1200,
             "max_posts_per_check": 10,
-            "debug_emoji": true,
-            "send_text_only_posts": false
+            "debug_emoji": True,
+            "send_text_only_posts": False
         }
         
         with open(config_file, 'w', encoding='utf-8') as f:
@@ -99,33 +398,106 @@ class RedditToTelegramBot:
                 client_secret=self.config['reddit']['client_secret'],
                 user_agent=self.config['reddit']['user_agent']
             )
-            # Testa a conexão
-            reddit.user.me()
-            logger.info("Conexão com Reddit estabelecida com sucesso")
+            # O bot apenas lê listagens; erros de conexão aparecem na primeira busca real
+            reddit.read_only = True
+            logger.info("Cliente do Reddit configurado")
             return reddit
         except Exception as e:
             logger.error(f"Erro ao conectar com Reddit: {e}")
             raise
     
-    def load_processed_posts(self) -> Set[str]:
-        """Carrega IDs de posts já processados"""
+    def health_check(self) -> bool:
+        """Verifica se a API do Reddit responde, buscando um único post"""
+        try:
+            next(iter(self.reddit.subreddit('all').hot(limit=1)))
+            logger.info("Conexão com Reddit estabelecida com sucesso")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao conectar com Reddit: {e}")
+            return False
+    
+    def load_processed_posts(self) -> OrderedDict:
+        """Carrega IDs de posts já processados (snapshot JSON + log de IDs novos)"""
+        # OrderedDict usado como conjunto ordenado por inserção, para descartar os mais antigos
+        processed = OrderedDict()
         try:
-            with open('processed_posts.json', 'r') as f:
-                return set(json.load(f))
+            processed.update(dict.fromkeys(read_json_file(PROCESSED_POSTS_FILE)))
         except FileNotFoundError:
-            return set()
+            pass
+        
+        self._processed_log_entries = 0
+        try:
+            with open(PROCESSED_POSTS_LOG, 'r', encoding='utf-8') as f:
+                for line in f:
+                    post_id = line.strip()
+                    if post_id:
+                        processed[post_id] = None
+                        self._processed_log_entries += 1
+        except FileNotFoundError:
+            pass
+        
+        while len(processed) > PROCESSED_MAX_HISTORY:
+            processed.popitem(last=False)
+        return processed
+    
+    def is_processed(self, post_id: str) -> bool:
+        """Indica se o post já foi processado"""
+        return post_id in self.processed_posts
+    
+    def mark_processed(self, post_id: str):
+        """Marca um post como processado, anexando o ID ao log"""
+        if post_id in self.processed_posts:
+            return
+        self.processed_posts[post_id] = None
+        if len(self.processed_posts) > PROCESSED_MAX_HISTORY:
+            self.processed_posts.popitem(last=False)
+        self._processed_log.write(post_id + '\n')
+        self._processed_log.flush()
+        self._processed_log_entries += 1
+        if self._processed_log_entries >= PROCESSED_COMPACT_EVERY:
+            self.compact_processed_posts()
     
     def save_processed_posts(self):
-        """Salva IDs de posts processados"""
-        with open('processed_posts.json', 'w') as f:
-            json.dump(list(self.processed_posts), f)
+        """Garante os IDs no disco e compacta o log quando ele fica grande"""
+        self._processed_log.flush()
+        if self._processed_log_entries >= PROCESSED_COMPACT_EVERY:
+            self.compact_processed_posts()
+    
+    def compact_processed_posts(self):
+        """Reescreve o snapshot JSON com todos os IDs e esvazia o log"""
+        # O log só é esvaziado depois que o novo snapshot está inteiro no disco
+        try:
+            write_json_file(PROCESSED_POSTS_FILE, list(self.processed_posts))
+        except OSError as e:
+            logger.error(f"Erro ao compactar histórico de posts: {e}")
+            return
+        self._processed_log.seek(0)
+        self._processed_log.truncate()
+        self._processed_log_entries = 0
+        logger.info(f"Histórico de posts compactado: {len(self.processed_posts)} IDs")
+    
+    def load_last_seen(self) -> Dict[str, str]:
+        """Carrega o fullname do último post visto em cada subreddit"""
+        try:
+            return read_json_file(LAST_SEEN_FILE)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"Erro ao carregar {LAST_SEEN_FILE}: {e}")
+            return {}
+    
+    def save_last_seen(self):
+        """Salva as âncoras dos subreddits"""
+        try:
+            write_json_file(LAST_SEEN_FILE, self.last_seen)
+        except OSError as e:
+            logger.error(f"Erro ao salvar {LAST_SEEN_FILE}: {e}")
     
     def load_failed_messages(self) -> List[Dict]:
         """Carrega mensagens que falharam no envio"""
         try:
             if os.path.exists('failed_messages.json'):
-                with open('failed_messages.json', 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return read_json_file('failed_messages.json')
         except Exception as e:
             logger.error(f"Erro ao carregar mensagens falhadas: {e}")
         return []
@@ -133,11 +505,45 @@ class RedditToTelegramBot:
     def save_failed_messages(self):
         """Salva mensagens que falharam no envio"""
         try:
-            with open('failed_messages.json', 'w', encoding='utf-8') as f:
-                json.dump(self.failed_messages, f, ensure_ascii=False, indent=2)
+            with self._failed_lock:
+                write_json_file('failed_messages.json', self.failed_messages, indent=True)
+                self._failed_dirty = False
         except Exception as e:
             logger.error(f"Erro ao salvar mensagens falhadas: {e}")
     
+    def flush_failed_messages(self):
+        """Salva mensagens falhadas somente se houve alteração desde o último save"""
+        if self._failed_dirty:
+            self.save_failed_messages()
+    
+    def _flush_loop(self):
+        """Grava periodicamente as mensagens falhadas pendentes"""
+        while not self._stop_event.wait(FAILED_FLUSH_INTERVAL):
+            self.flush_failed_messages()
+    
+    def _retry_loop(self):
+        """Reenvia periodicamente as mensagens falhadas cuja próxima tentativa já venceu"""
+        while not self._stop_event.wait(FAILED_RETRY_INTERVAL):
+            try:
+                self.retry_failed_messages()
+            except Exception as e:
+                logger.error(f"Erro ao reenviar mensagens falhadas: {e}")
+    
+    def close(self):
+        """Para as threads de segundo plano, grava o estado pendente e fecha as conexões"""
+        if self._stop_event.is_set():
+            return  # Já fechado
+        self._stop_event.set()
+        # Deixa um reenvio em andamento terminar antes de fechar a sessão HTTP
+        self._retry_thread.join(timeout=TELEGRAM_TIMEOUT[1])
+        self.flush_failed_messages()
+        # No desligamento limpo o log é sempre incorporado ao snapshot
+        if self._processed_log_entries:
+            self.compact_processed_posts()
+        self._processed_log.close()
+        self.http.close()
+        self._preflight_http.close()
+    
     def add_failed_message(self, message: str, media_url: str = None, post_url: str = None):
         """Adiciona uma mensagem à lista de falhadas"""
         failed_msg = {
@@ -145,67 +551,122 @@ class RedditToTelegramBot:
             'media_url': media_url,
             'post_url': post_url,
             'timestamp': datetime.now().isoformat(),
-            'retry_count': 0
+            'retry_count': 0,
+            'next_attempt_ts': time.time() + FAILED_RETRY_BASE_DELAY
         }
-        self.failed_messages.append(failed_msg)
-        self.save_failed_messages()
+        with self._failed_lock:
+            self.failed_messages.append(failed_msg)
+            self._failed_dirty = True
         logger.info(f"Mensagem adicionada à lista de falhadas: {len(self.failed_messages)} total")
     
     def retry_failed_messages(self):
-        """Tenta reenviar mensagens falhadas como texto simples"""
-        if not self.failed_messages:
+        """Tenta reenviar como texto simples as mensagens falhadas cuja próxima tentativa venceu"""
+        # Mensagens antigas, sem next_attempt_ts, já estão vencidas
+        now = time.time()
+        with self._failed_lock:
+            due = [m for m in self.failed_messages if m.get('next_attempt_ts', 0) <= now]
+        if not due:
             return
         
-        logger.info(f"Tentando reenviar {len(self.failed_messages)} mensagens falhadas...")
-        messages_to_remove = []
+        logger.info(f"Tentando reenviar {len(due)} de {len(self.failed_messages)} mensagens falhadas...")
         
-        for i, failed_msg in enumerate(self.failed_messages):
-            try:
-                # Cria mensagem de texto com link se disponível
-                text_message = failed_msg['message']
-                if failed_msg.get('post_url'):
-                    text_message += f"\n\n🔗 [Ver post original]({failed_msg['post_url']})"
-                
-                # Tenta enviar como texto simples
-                if self.send_text_message(text_message):
-                    messages_to_remove.append(i)
-                    logger.info(f"Mensagem falhada reenviada com sucesso")
-                else:
-                    failed_msg['retry_count'] += 1
-                    if failed_msg['retry_count'] >= 3:
-                        messages_to_remove.append(i)
-                        logger.warning(f"Mensagem descartada após 3 tentativas")
-                
-            except Exception as e:
-                logger.error(f"Erro ao reenviar mensagem falhada: {e}")
-                failed_msg['retry_count'] += 1
-                if failed_msg['retry_count'] >= 3:
-                    messages_to_remove.append(i)
+        # Reenvia em paralelo, limitado a max_concurrent_sends conexões simultâneas
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_sends) as executor:
+            results = list(executor.map(self._retry_one, due))
         
-        # Remove mensagens processadas (em ordem reversa para não afetar índices)
-        for i in reversed(messages_to_remove):
-            self.failed_messages.pop(i)
+        done = {id(m) for m, should_remove in zip(due, results) if should_remove}
         
-        if messages_to_remove:
-            self.save_failed_messages()
-            logger.info(f"Removidas {len(messages_to_remove)} mensagens da lista de falhadas")
+        # Filtra a lista uma única vez em vez de remover item a item
+        with self._failed_lock:
+            self.failed_messages = [m for m in self.failed_messages if id(m) not in done]
+            # retry_count e next_attempt_ts também mudam a cada tentativa
+            self._failed_dirty = True
+        self.flush_failed_messages()
+        
+        if done:
+            logger.info(f"Removidas {len(done)} mensagens da lista de falhadas")
+    
+    def _retry_one(self, failed_msg: Dict) -> bool:
+        """Tenta reenviar uma mensagem falhada; retorna True se ela deve sair da lista"""
+        try:
+            # Cria mensagem de texto com link se disponível
+            text_message = failed_msg['message']
+            if failed_msg.get('post_url'):
+                text_message += f"\n\n🔗 [Ver post original]({failed_msg['post_url']})"
+            
+            # Tenta enviar como texto simples
+            if self.send_text_message(text_message):
+                logger.info(f"Mensagem falhada reenviada com sucesso")
+                return True
+            
+        except Exception as e:
+            logger.error(f"Erro ao reenviar mensagem falhada: {e}")
+        
+        with self._failed_lock:
+            failed_msg['retry_count'] += 1
+            retry_count = failed_msg['retry_count']
+            delay = min(FAILED_RETRY_BASE_DELAY * 2 ** retry_count, FAILED_RETRY_MAX_DELAY)
+            failed_msg['next_attempt_ts'] = time.time() + delay
+        if retry_count >= FAILED_RETRY_MAX_ATTEMPTS:
+            logger.warning(f"Mensagem descartada após {FAILED_RETRY_MAX_ATTEMPTS} tentativas")
+            return True
+        return False
+    
+    def get_chat_limiter(self, chat_id) -> RateLimiter:
+        """Retorna o limitador de envio do chat, criando-o se necessário"""
+        with self._limiters_lock:
+            limiter = self.chat_limiters.get(chat_id)
+            if limiter is None:
+                limiter = self.chat_limiters[chat_id] = RateLimiter(*TELEGRAM_CHAT_RATE)
+            return limiter
+    
+    def _post_telegram(self, method: str, data: Dict, files: Dict = None, timeout=TELEGRAM_TIMEOUT,
+                       messages: int = 1) -> requests.Response:
+        """Faz POST na API do Telegram com backoff exponencial para erros transitórios.
+        
+        Respostas 429 respeitam o retry_after informado pelo Telegram. Timeouts
+        não são repetidos: a exceção sobe direto para o fallback do chamador.
+        messages é quantas mensagens a chamada gera no chat (um álbum conta cada item).
+        """
+        url = self._telegram_api + method
+        chat_limiter = self.get_chat_limiter(data.get('chat_id'))
+        
+        for attempt in range(1, TELEGRAM_MAX_ATTEMPTS + 1):
+            chat_limiter.acquire(messages)
+            self.global_limiter.acquire()
+            
+            # Arquivos precisam voltar ao início antes de cada novo upload
+            if files:
+                for file_obj in files.values():
+                    file_obj.seek(0)
+            
+            response = self.http.post(url, data=data, files=files, timeout=timeout)
+            if response.status_code not in TELEGRAM_RETRY_STATUSES or attempt == TELEGRAM_MAX_ATTEMPTS:
+                response.raise_for_status()
+                return response
+            
+            delay = min(2 ** (attempt - 1), TELEGRAM_MAX_BACKOFF)
+            if response.status_code == 429:
+                try:
+                    delay = response.json()['parameters']['retry_after']
+                except (ValueError, KeyError, TypeError):
+                    pass
+            
+            logger.warning(f"Telegram {method} retornou {response.status_code}. "
+                           f"Tentativa {attempt + 1}/{TELEGRAM_MAX_ATTEMPTS} em {delay}s")
+            time.sleep(delay)
     
     def send_text_message(self, message: str) -> bool:
         """Envia apenas mensagem de texto para o Telegram"""
-        bot_token = self.config['telegram']['bot_token']
-        chat_id = self.config['telegram']['chat_id']
-        
         try:
-            url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
             data = {
-                'chat_id': chat_id,
+                'chat_id': self._chat_id,
                 'text': message,
                 'parse_mode': 'Markdown',
                 'disable_web_page_preview': False
             }
             
-            response = requests.post(url, data=data, timeout=30)
-            response.raise_for_status()
+            self._post_telegram('sendMessage', data)
             
             return True
             
@@ -215,148 +676,176 @@ class RedditToTelegramBot:
     
 
     
-    def download_reddit_image(self, post) -> Optional[str]:
-        """Baixa imagem do Reddit e retorna a URL da melhor qualidade"""
+    def _analyze_media(self, post) -> MediaInfo:
+        """Retorna a análise de mídia do post, reaproveitando o resultado por post.id"""
+        info = self._media_cache.get(post.id)
+        if info is None:
+            info = self._compute_media_info(post)
+            self._media_cache[post.id] = info
+            if len(self._media_cache) > MEDIA_CACHE_SIZE:
+                self._media_cache.popitem(last=False)  # Descarta o mais antigo (FIFO)
+        return info
+    
+    def _compute_media_info(self, post) -> MediaInfo:
+        """Analisa media_metadata, media, preview e URL do post em uma única passada"""
         try:
+            # Lê os campos direto do que veio na listagem: um atributo ausente acessado pelo
+            # objeto do PRAW dispara uma requisição extra para buscar o post completo
+            raw = vars(post)
+            is_video = raw.get('is_video', False)
+            media = raw.get('media')
+            media_metadata = raw.get('media_metadata')
+            preview = raw.get('preview')
+            url_kind = _classify_url(post.url) if not post.is_self and post.url else None
+            
             image_url = None
+            video_url = None
+            image_urls = []
             
-            # Método 1: Verifica media_metadata para imagens (apenas a primeira)
-            if hasattr(post, 'media_metadata') and post.media_metadata:
-                logger.info(f"Verificando media_metadata para imagens (apenas primeira)")
-                # Ordena as chaves para garantir consistência na ordem
-                sorted_media_ids = sorted(post.media_metadata.keys())
-                for media_id in sorted_media_ids:
-                    media_info = post.media_metadata[media_id]
-                    if media_info.get('e') == 'Image':
-                        # Prioriza a imagem de melhor qualidade (campo 's')
-                        if 's' in media_info and 'u' in media_info['s']:
-                            image_url = media_info['s']['u']
-                            logger.info(f"URL da primeira imagem encontrada via media_metadata (melhor qualidade): {image_url}")
-                            break
-                        # Fallback para o campo 'o' (original)
-                        elif 'o' in media_info and len(media_info['o']) > 0 and 'u' in media_info['o'][0]:
-                            image_url = media_info['o'][0]['u']
-                            logger.info(f"URL da primeira imagem encontrada via media_metadata (original): {image_url}")
-                            break
-                        # Fallback para o maior preview disponível
-                        elif 'p' in media_info and len(media_info['p']) > 0:
-                            # Pega o maior preview disponível
-                            largest_preview = max(media_info['p'], key=lambda x: x.get('x', 0) * x.get('y', 0))
-                            if 'u' in largest_preview:
-                                image_url = largest_preview['u']
-                                logger.info(f"URL da primeira imagem encontrada via media_metadata (preview): {image_url}")
-                                break
+            # Vídeo direto do Reddit (is_video=True)
+            if is_video:
+                if media:
+                    if 'reddit_video' in media:
+                        video_url = media['reddit_video']['fallback_url']
+                    elif 'oembed' in media:
+                        video_url = media['oembed'].get('thumbnail_url')
+                
+                if not video_url and 'v.redd.it' in post.url:
+                    video_url = post.url + '/DASH_720.mp4'
             
-            # Método 2: Verifica se a URL do post é uma imagem direta
-            if not image_url and not post.is_self:
-                if any(ext in post.url.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
-                    image_url = post.url
-                    logger.info(f"URL da imagem encontrada diretamente: {image_url}")
-            
-            # Método 3: Verifica preview para imagens (apenas a primeira)
-            if not image_url and hasattr(post, 'preview') and post.preview:
-                if 'images' in post.preview and len(post.preview['images']) > 0:
-                    preview_image = post.preview['images'][0]  # Pega apenas a primeira imagem
-                    if 'source' in preview_image and 'url' in preview_image['source']:
-                        image_url = preview_image['source']['url']
-                        logger.info(f"URL da primeira imagem encontrada no preview: {image_url}")
-            
-            if not image_url:
-                logger.info(f"Nenhuma URL de imagem encontrada para o post {post.id}")
-                return None
+            # Post de texto com vídeo incorporado (is_self=True)
+            elif post.is_self and media and 'reddit_video' in media:
+                video_url = media['reddit_video']['fallback_url']
             
-            # Limpa caracteres de escape HTML
-            image_url = image_url.replace('&amp;', '&')
+            # media_metadata: imagens da galeria e primeiro vídeo (posts NSFW/galerias), em uma só passada
+            if media_metadata:
+                for media_id in self._media_metadata_order(raw, media_metadata):
+                    media_info = media_metadata.get(media_id, {})
+                    entry_type = media_info.get('e')
+                    if entry_type == 'Image' and len(image_urls) < MEDIA_GROUP_MAX:
+                        metadata_url = self._metadata_image_url(media_info)
+                        if metadata_url:
+                            image_urls.append(metadata_url.replace('&amp;', '&'))
+                    elif entry_type == 'RedditVideo' and not video_url:
+                        # Prioriza HLS sobre DASH
+                        video_url = media_info.get('hlsUrl') or media_info.get('dashUrl')
+                    if len(image_urls) >= MEDIA_GROUP_MAX and video_url:
+                        break
+                if image_urls:
+                    image_url = image_urls[0]
+            
+            # URL do post é uma imagem direta
+            if not image_url and url_kind == 'image':
+                image_url = post.url
+            
+            # Preview: vídeo e primeira imagem
+            if preview:
+                if not video_url and 'reddit_video_preview' in preview:
+                    video_url = preview['reddit_video_preview']['fallback_url']
+                if not image_url and preview.get('images'):
+                    source = preview['images'][0].get('source', {})
+                    image_url = source.get('url')
+            
+            if image_url:
+                # Limpa caracteres de escape HTML
+                image_url = image_url.replace('&amp;', '&')
+                if not image_urls:
+                    image_urls = [image_url]
+            
+            # Para URLs HLS e DASH, mantém os parâmetros de query
+            # Apenas remove parâmetros para URLs diretas de MP4
+            if video_url and not any(format_type in video_url for format_type in ['HLSPlaylist.m3u8', 'DASHPlaylist.mpd']):
+                video_url = video_url.split('?')[0]
+            
+            if video_url:
+                kind = 'video'
+            elif image_url:
+                kind = 'image'
+            elif is_video or media_metadata or media or preview or url_kind not in (None, 'link'):
+                kind = 'link'  # Há mídia, mas sem URL aproveitável
+            else:
+                kind = 'none'
             
-            return image_url
+            return MediaInfo(kind, image_url, video_url, image_urls)
             
         except Exception as e:
-            logger.error(f"Erro ao extrair URL da imagem do Reddit: {e}")
-            return None
+            logger.error(f"Erro ao analisar mídia do post {post.id}: {e}")
+            return MediaInfo('none')
+    
+    def _media_metadata_order(self, raw: Dict, media_metadata: Dict) -> List[str]:
+        """Ordem dos itens do media_metadata: a da galeria, se houver, senão a das chaves"""
+        gallery_data = raw.get('gallery_data')
+        if gallery_data and gallery_data.get('items'):
+            return [item['media_id'] for item in gallery_data['items'] if 'media_id' in item]
+        # Ordena as chaves para garantir consistência na ordem
+        return sorted(media_metadata.keys())
+    
+    def _metadata_image_url(self, media_info: Dict) -> Optional[str]:
+        """Retorna a URL de melhor qualidade de uma imagem do media_metadata"""
+        # Prioriza a imagem de melhor qualidade (campo 's')
+        if 's' in media_info and 'u' in media_info['s']:
+            return media_info['s']['u']
+        # Fallback para o campo 'o' (original)
+        if 'o' in media_info and len(media_info['o']) > 0 and 'u' in media_info['o'][0]:
+            return media_info['o'][0]['u']
+        # Fallback para o maior preview disponível
+        if 'p' in media_info and len(media_info['p']) > 0:
+            largest_preview = max(media_info['p'], key=lambda x: x.get('x', 0) * x.get('y', 0))
+            return largest_preview.get('u')
+        return None
+    
+    def download_reddit_image(self, post, media: MediaInfo = None) -> List[str]:
+        """Retorna as URLs das imagens do post (galerias: até 10, na ordem do álbum)"""
+        media = media or self._analyze_media(post)
+        if not media.image_urls:
+            logger.info(f"Nenhuma URL de imagem encontrada para o post {post.id}")
+            return []
+        
+        logger.info(f"{len(media.image_urls)} imagem(ns) encontrada(s), primeira: {media.image_urls[0]}")
+        return media.image_urls
     
-    def download_reddit_video(self, post) -> Optional[str]:
+    def download_reddit_video(self, post, media: MediaInfo = None) -> Optional[str]:
         """Baixa vídeo do Reddit e retorna o caminho do arquivo temporário"""
         try:
-            video_url = None
-            
-            # Método 1: Vídeo direto do Reddit (is_video=True)
-            if hasattr(post, 'is_video') and post.is_video:
-                if hasattr(post, 'media') and post.media:
-                    if 'reddit_video' in post.media:
-                        video_url = post.media['reddit_video']['fallback_url']
-                    elif 'oembed' in post.media:
-                        video_url = post.media['oembed'].get('thumbnail_url')
-                
-                if not video_url and 'v.redd.it' in post.url:
-                    video_url = post.url + '/DASH_720.mp4'
-            
-            # Método 2: Post de texto com vídeo incorporado (is_self=True)
-            elif post.is_self and hasattr(post, 'media') and post.media:
-                logger.info(f"Analisando post de texto com media: {post.media}")
-                if 'reddit_video' in post.media:
-                    video_url = post.media['reddit_video']['fallback_url']
-                    logger.info(f"Vídeo encontrado em post de texto: {video_url}")
-            
-            # Método 3: Vídeo em media_metadata (posts NSFW com vídeo incorporado) - apenas o primeiro
-            if not video_url and hasattr(post, 'media_metadata') and post.media_metadata:
-                logger.info(f"Método 3: Verificando media_metadata (apenas primeiro vídeo)")
-                # Ordena as chaves para garantir consistência na ordem
-                sorted_media_ids = sorted(post.media_metadata.keys())
-                for media_id in sorted_media_ids:
-                    media_info = post.media_metadata[media_id]
-                    if media_info.get('e') == 'RedditVideo':
-                        # Prioriza HLS sobre DASH
-                        if 'hlsUrl' in media_info:
-                            video_url = media_info['hlsUrl']
-                            logger.info(f"URL HLS do primeiro vídeo encontrada via media_metadata: {video_url}")
-                            break
-                        elif 'dashUrl' in media_info:
-                            video_url = media_info['dashUrl']
-                            logger.info(f"URL DASH do primeiro vídeo encontrada via media_metadata: {video_url}")
-                            break
-            
-            # Método 4: Verifica se há preview com vídeo
-            if not video_url and hasattr(post, 'preview') and post.preview:
-                logger.info(f"Verificando preview para vídeo")
-                if 'reddit_video_preview' in post.preview:
-                    video_url = post.preview['reddit_video_preview']['fallback_url']
-                    logger.info(f"Vídeo encontrado no preview: {video_url}")
+            media = media or self._analyze_media(post)
+            video_url = media.video_url
             
             if not video_url:
                 logger.info(f"Nenhuma URL de vídeo encontrada para o post {post.id}")
                 return None
             
-            # Para URLs HLS e DASH, mantém os parâmetros de query
-            # Apenas remove parâmetros para URLs diretas de MP4
-            if not any(format_type in video_url for format_type in ['HLSPlaylist.m3u8', 'DASHPlaylist.mpd']):
-                video_url = video_url.split('?')[0]
-            
             # Verifica se é HLS ou DASH que precisa de conversão
             if 'HLSPlaylist.m3u8' in video_url or 'DASHPlaylist.mpd' in video_url:
                 logger.info(f"Detectado stream HLS/DASH, usando yt-dlp com URL do post: {post.url}")
                 return self.convert_hls_to_mp4(post.url)
             else:
-                # Baixa vídeo MP4 direto
-                logger.info(f"Baixando vídeo MP4: {video_url}")
-                response = requests.get(video_url, timeout=60, stream=True)
-                response.raise_for_status()
-                
-                # Cria arquivo temporário
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp4')
-                
-                # Escreve o conteúdo do vídeo
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        temp_file.write(chunk)
-                
-                temp_file.close()
-                logger.info(f"Vídeo baixado: {temp_file.name}")
-                return temp_file.name
+                return self.download_mp4(video_url)
             
         except Exception as e:
             logger.error(f"Erro ao baixar vídeo do Reddit: {e}")
             return None
     
+    def download_mp4(self, video_url: str) -> str:
+        """Baixa um vídeo MP4 direto para um arquivo temporário e retorna o caminho"""
+        logger.info(f"Baixando vídeo MP4: {video_url}")
+        # Cria arquivo temporário
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp4')
+        temp_file.close()
+        
+        # Copia o corpo da resposta direto para o disco em blocos de 1 MiB
+        try:
+            with self.http.get(video_url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with open(temp_file.name, 'wb', buffering=DOWNLOAD_BUFFER_SIZE) as f:
+                    shutil.copyfileobj(response.raw, f, length=DOWNLOAD_BUFFER_SIZE)
+        except Exception:
+            os.unlink(temp_file.name)
+            raise
+        
+        logger.info(f"Vídeo baixado: {temp_file.name}")
+        return temp_file.name
+    
     def convert_hls_to_mp4(self, reddit_url: str) -> Optional[str]:
         """Baixa vídeo do Reddit usando yt-dlp"""
         try:
@@ -376,7 +865,7 @@ class RedditToTelegramBot:
                 '--user-agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                 '--format', 'dash-4+dash-6/dash-3+dash-6/dash-2+dash-6/dash-1+dash-6/hls-1157-0/hls-768-0/hls-455-0/hls-297-0/best',  # Formatos específicos do Reddit
                 '--no-post-overwrites',
-                '--verbose',        # Mais informações para debug
+                '--no-progress',    # Evita encher stdout com a barra de progresso
                 reddit_url
             ]
             
@@ -396,19 +885,17 @@ class RedditToTelegramBot:
                 if result.returncode == 0:
                     # Procura por arquivos baixados com qualquer extensão
                     base_name = temp_file.name.replace('.mp4', '')
-                    possible_files = []
                     
-                    # Verifica diretório para arquivos com o nome base
+                    # Encontra o primeiro arquivo não vazio com o nome base (um stat por candidato)
                     import glob
-                    pattern = base_name + '.*'
-                    possible_files = glob.glob(pattern)
-                    
-                    # Encontra o arquivo baixado
                     downloaded_file = None
-                    for file_path in possible_files:
-                        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                            downloaded_file = file_path
-                            break
+                    for file_path in glob.iglob(base_name + '.*'):
+                        try:
+                            if os.stat(file_path).st_size > 0:
+                                downloaded_file = file_path
+                                break
+                        except FileNotFoundError:
+                            pass
                     
                     if downloaded_file:
                         logger.info(f"Download HLS/DASH concluído: {downloaded_file}")
@@ -421,20 +908,15 @@ class RedditToTelegramBot:
                     logger.warning(f"stdout: {result.stdout}")
                     logger.warning(f"stderr: {result.stderr}")
                     
-                    # Tenta listar formatos disponíveis para debug
-                    try:
-                        list_cmd = ['yt-dlp', '--list-formats', reddit_url]
-                        list_result = subprocess.run(list_cmd, capture_output=True, text=True, timeout=30)
-                        if list_result.returncode == 0:
-                            logger.info(f"Formatos disponíveis para {reddit_url}:")
-                            logger.info(list_result.stdout)
-                    except Exception as e:
-                        logger.warning(f"Erro ao listar formatos: {e}")
-                    
                     if os.path.exists(temp_file.name):
                         os.unlink(temp_file.name)
                     return None
                     
+            except FileNotFoundError:
+                logger.error("yt-dlp não encontrado. Instale o yt-dlp para baixar vídeos HLS/DASH")
+                if os.path.exists(temp_file.name):
+                    os.unlink(temp_file.name)
+                return None
             except subprocess.TimeoutExpired:
                 logger.warning("Timeout no download com yt-dlp")
                 if os.path.exists(temp_file.name):
@@ -466,56 +948,36 @@ class RedditToTelegramBot:
     
     def has_media_content(self, post) -> bool:
         """Verifica se o post contém mídia (imagem ou vídeo)"""
-        try:
-            # Verifica se é vídeo do Reddit
-            if hasattr(post, 'is_video') and post.is_video:
-                return True
-            
-            # Verifica se tem media_metadata (imagens/vídeos)
-            if hasattr(post, 'media_metadata') and post.media_metadata:
-                return True
-            
-            # Verifica se tem media (vídeos)
-            if hasattr(post, 'media') and post.media:
-                return True
-            
-            # Verifica se tem preview (imagens)
-            if hasattr(post, 'preview') and post.preview:
-                return True
-            
-            # Verifica se a URL é uma imagem/vídeo direto
-            if not post.is_self and post.url:
-                media_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.mp4', '.webm', '.mov']
-                if any(ext in post.url.lower() for ext in media_extensions):
-                    return True
-                
-                # Verifica se é link de vídeo conhecido
-                video_domains = ['youtube.com', 'youtu.be', 'v.redd.it', 'reddit.com/gallery']
-                if any(domain in post.url.lower() for domain in video_domains):
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            logger.error(f"Erro ao verificar mídia do post {post.id}: {e}")
-            return False
+        return self._analyze_media(post).kind != 'none'
+    
+    def build_message_templates(self):
+        """Pré-monta os modelos de mensagem com o link do bot já embutido"""
+        # Link do bot vem da configuração (chaves escapadas para o str.format_map)
+        bot_link = self.config.get('bot_link', 'https://t.me/seu_bot_aqui')
+        bot_link = bot_link.replace('{', '{{').replace('}', '}}')
+        
+        footer = f"""
+
+💎 Quer acessar o melhor conteúdo exclusivo?
+🎯 *Conteúdo Premium*: Curadoria especial para membros que buscam qualidade e variedade!
+
+🚀 *VIP COMPLETO* - [CLIQUE AQUI]({bot_link}) 🚀"""
+        
+        self._tpl_named = "{prefix}🔥 *{name}* • *COMPLETO NO VIP* 🔥" + footer
+        self._tpl_plain = "{prefix}🔥 *COMPLETO NO VIP* 🔥" + footer
+        self._debug_emoji = self.config.get('debug_emoji', True)  # Padrão é True para compatibilidade
     
     def extract_model_name(self, title: str) -> str:
         """Extrai o nome da modelo do título do post"""
         # Procura por padrão: Nome | resto do título
-        match = re.search(r'^([^|]+)\s*\|', title)
+        match = _MODEL_RE.match(title)
         if match:
             potential_name = match.group(1).strip()
             
-            # Verifica se contém pelo menos um nome próprio (palavra com letra maiúscula)
-            # Remove números e caracteres especiais para análise
-            clean_name = re.sub(r'[0-9@#$%^&*()_+=\[\]{};\'": ,.<>?/~`]', '', potential_name)
-            words = clean_name.split()
-            
-            # Verifica se há pelo menos uma palavra que parece um nome (começa com maiúscula)
-            has_proper_name = any(word[0].isupper() and len(word) > 1 for word in words if word)
-            
-            if has_proper_name:
+            # Remove números e caracteres especiais (str.translate, numa passada em C) e verifica
+            # se há pelo menos uma palavra que parece um nome (começa com maiúscula)
+            words = potential_name.translate(_MODEL_IGNORED).split()
+            if any(word[0].isupper() and len(word) > 1 for word in words):
                 return potential_name
         
         return None
@@ -525,66 +987,74 @@ class RedditToTelegramBot:
         # Emoji de debug baseado no tipo de conteúdo (se habilitado)
         debug_emoji = ""
         
-        if self.config.get('debug_emoji', True):  # Padrão é True para compatibilidade
+        if self._debug_emoji:
             debug_emoji = "📝"  # Padrão para texto
             
-            if hasattr(post, 'is_video') and post.is_video:
+            url = post.url
+            if vars(post).get('is_video', False):
                 debug_emoji = "🎥"  # Vídeo
-            elif post.url and not post.is_self:
-                if any(ext in post.url.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
-                    debug_emoji = "🖼️"  # Imagem
-                elif any(ext in post.url.lower() for ext in ['.mp4', '.webm', '.mov']):
-                    debug_emoji = "🎬"  # Vídeo por extensão
-                elif 'youtube.com' in post.url.lower() or 'youtu.be' in post.url.lower():
-                    debug_emoji = "📺"  # YouTube
-                elif 'reddit.com/gallery' in post.url.lower():
-                    debug_emoji = "🖼️"  # Galeria Reddit
-                else:
-                    debug_emoji = "🔗"  # Link genérico
+            elif url and not post.is_self:
+                debug_emoji = _URL_EMOJIS[_classify_url(url)]
         
         # Extrai o nome da modelo do título
         model_name = self.extract_model_name(post.title)
-        
-        # Link do bot vem da configuração
-        bot_link = self.config.get('bot_link', 'https://t.me/seu_bot_aqui')
-        
-        # Monta a mensagem personalizada com formatação melhorada
         if model_name:
-            standard_message = f"""🔥 *{model_name}* • *COMPLETO NO VIP* 🔥
-
-💎 Quer acessar o melhor conteúdo exclusivo?
-🎯 *Conteúdo Premium*: Curadoria especial para membros que buscam qualidade e variedade!
-
-🚀 *VIP COMPLETO* - [CLIQUE AQUI]({bot_link}) 🚀"""
-        else:
-            standard_message = f"""🔥 *COMPLETO NO VIP* 🔥
-
-💎 Quer acessar o melhor conteúdo exclusivo?
-🎯 *Conteúdo Premium*: Curadoria especial para membros que buscam qualidade e variedade!
-
-🚀 *VIP COMPLETO* - [CLIQUE AQUI]({bot_link}) 🚀"""
+            # '*' fecharia o negrito antes da hora e o Markdown legado não aceita escape dentro da entidade
+            model_name = model_name.replace('*', '')
         
-        # Formata a mensagem com emoji e mensagem padrão (sem corpo do post)
-        if debug_emoji:
-            message = f"{debug_emoji}\n\n{standard_message}"
-        else:
-            message = standard_message
+        # Prefixo com o emoji de depuração (sem corpo do post)
+        prefix = f"{debug_emoji}\n\n" if debug_emoji else ""
         
-        return message
+        if model_name:
+            return self._tpl_named.format_map({'prefix': prefix, 'name': model_name})
+        return self._tpl_plain.format_map({'prefix': prefix})
+    
+    def send_telegram_media_group(self, urls: List[str], caption: str):
+        """Envia várias imagens como um único álbum (sendMediaGroup); legenda vai no primeiro item"""
+        media = [
+            {'type': 'photo', 'media': url, 'caption': caption, 'parse_mode': 'Markdown'} if i == 0
+            else {'type': 'photo', 'media': url}
+            for i, url in enumerate(urls[:MEDIA_GROUP_MAX])
+        ]
+        data = {
+            'chat_id': self._chat_id,
+            'media': json.dumps(media)
+        }
+        # O limite por grupo do Telegram conta cada item do álbum como uma mensagem
+        self._post_telegram('sendMediaGroup', data, messages=len(media))
+    
+    def send_telegram_video_url(self, video_url: str, caption: str):
+        """Envia um vídeo pela URL (sendVideo); o próprio Telegram baixa o arquivo do Reddit"""
+        data = {
+            'chat_id': self._chat_id,
+            'video': video_url,
+            'caption': caption,
+            'parse_mode': 'Markdown'
+        }
+        # O Telegram só responde depois de baixar o vídeo: usa o timeout de upload
+        self._post_telegram('sendVideo', data, timeout=TELEGRAM_UPLOAD_TIMEOUT)
     
-    def send_telegram_message(self, message: str, media_url: str = None, video_file_path: str = None, post_url: str = None, is_nsfw: bool = False) -> bool:
+    def send_telegram_message(self, message: str, media_url: str = None, video_file_path: str = None, post_url: str = None, is_nsfw: bool = False, media_group: List[str] = None) -> bool:
         """Envia mensagem para o Telegram com sistema de fallback"""
-        bot_token = self.config['telegram']['bot_token']
-        chat_id = self.config['telegram']['chat_id']
+        chat_id = self._chat_id
         
         if is_nsfw:
             logger.info(f"Enviando conteúdo NSFW - URL: {media_url or video_file_path}")
         
         try:
+            # Galeria com várias imagens: envia tudo em um único álbum
+            photos = [url for url in media_group or [] if _parse_url(url).path.endswith(_PHOTO_EXTS)]
+            if not video_file_path and len(photos) > 1:
+                try:
+                    self.send_telegram_media_group(photos, message)
+                    logger.info(f"Álbum com {len(photos)} imagens enviado com sucesso para o Telegram")
+                    return True
+                except requests.exceptions.RequestException as group_error:
+                    logger.warning(f"Falha ao enviar álbum: {group_error}. Tentando apenas a primeira imagem")
+                    media_url = photos[0]
+            
             # Se há arquivo de vídeo local, envia como vídeo
             if video_file_path and os.path.exists(video_file_path):
-                url = f"https://api.telegram.org/bot{bot_token}/sendVideo"
-                
                 try:
                     with open(video_file_path, 'rb') as video_file:
                         files = {'video': video_file}
@@ -594,8 +1064,7 @@ class RedditToTelegramBot:
                             'parse_mode': 'Markdown'
                         }
                         
-                        response = requests.post(url, files=files, data=data, timeout=120)
-                        response.raise_for_status()
+                        self._post_telegram('sendVideo', data, files=files, timeout=TELEGRAM_UPLOAD_TIMEOUT)
                         
                     logger.info("Vídeo enviado com sucesso para o Telegram")
                     return True
@@ -613,8 +1082,7 @@ class RedditToTelegramBot:
                     return self.send_text_message(fallback_message)
                 
             # Se há mídia URL, tenta enviar como foto
-            elif media_url and any(ext in media_url.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif']):
-                url = f"https://api.telegram.org/bot{bot_token}/sendPhoto"
+            elif media_url and _parse_url(media_url).path.endswith(_PHOTO_EXTS):
                 data = {
                     'chat_id': chat_id,
                     'photo': media_url,
@@ -622,9 +1090,12 @@ class RedditToTelegramBot:
                     'parse_mode': 'Markdown'
                 }
                 
+                # Pula o round-trip do sendPhoto quando o Telegram não conseguiria baixar a imagem
+                if not self._telegram_can_fetch(media_url):
+                    return self._send_photo_fallback(message, media_url, post_url, is_nsfw)
+                
                 try:
-                    response = requests.post(url, data=data, timeout=30)
-                    response.raise_for_status()
+                    self._post_telegram('sendPhoto', data)
                     
                     logger.info("Foto enviada com sucesso para o Telegram")
                     return True
@@ -636,19 +1107,11 @@ class RedditToTelegramBot:
                     else:
                         logger.warning(f"Falha ao enviar foto: {error_msg}")
                     
-                    # Adiciona à lista de mensagens falhadas
-                    self.add_failed_message(message, media_url, post_url)
-                    
-                    # Tenta enviar como texto simples
-                    if is_nsfw:
-                        fallback_message = f"{message}\n\n⚠️ Conteúdo não pôde ser enviado"
-                    else:
-                        fallback_message = f"{message}\n\n⚠️ Imagem não pôde ser enviada\n🔗 Link: {media_url}"
-                    
-                    if post_url:
-                        fallback_message += f"\n📝 [Ver post original]({post_url})"
-                    
-                    return self.send_text_message(fallback_message)
+                    # Só conta contra o host quando o Telegram não conseguiu baixar a imagem;
+                    # erros de legenda/Markdown não têm relação com o host
+                    if self._is_fetch_error(photo_error):
+                        self._record_host_failure(media_url)
+                    return self._send_photo_fallback(message, media_url, post_url, is_nsfw)
                 
             else:
                 # Envia como mensagem de texto
@@ -661,95 +1124,331 @@ class RedditToTelegramBot:
                 self.add_failed_message(message, media_url or video_file_path, post_url)
             return False
     
+    def _send_photo_fallback(self, message: str, media_url: str, post_url: str, is_nsfw: bool) -> bool:
+        """Registra a foto como falhada e envia a mensagem como texto simples"""
+        # Adiciona à lista de mensagens falhadas
+        self.add_failed_message(message, media_url, post_url)
+        
+        # Tenta enviar como texto simples
+        if is_nsfw:
+            fallback_message = f"{message}\n\n⚠️ Conteúdo não pôde ser enviado"
+        else:
+            fallback_message = f"{message}\n\n⚠️ Imagem não pôde ser enviada\n🔗 Link: {media_url}"
+        
+        if post_url:
+            fallback_message += f"\n📝 [Ver post original]({post_url})"
+        
+        return self.send_text_message(fallback_message)
+    
+    @staticmethod
+    def _is_fetch_error(error: requests.exceptions.RequestException) -> bool:
+        """Indica se o erro do sendPhoto foi o Telegram não conseguir baixar a imagem"""
+        response = getattr(error, 'response', None)
+        if response is None:
+            return False
+        try:
+            description = response.json().get('description', '')
+        except (ValueError, AttributeError):
+            return False
+        return TELEGRAM_FETCH_ERROR in description.lower()
+    
+    def _record_host_failure(self, url: str):
+        """Conta uma falha do host de mídia (conexão, 403, 5xx ou download recusado pelo Telegram)"""
+        host = _parse_url(url).hostname or ''
+        now = time.time()
+        with self._host_lock:
+            self._host_ok.pop(host, None)
+            count, last_ts = self._host_failures.get(host, (0, 0))
+            if now - last_ts > HOST_FAILURE_WINDOW:
+                count = 0
+            self._host_failures[host] = (count + 1, now)
+    
+    def _telegram_can_fetch(self, url: str) -> bool:
+        """Verifica (com um HEAD) se o Telegram deve conseguir baixar a imagem pela URL"""
+        host = _parse_url(url).hostname or ''
+        now = time.time()
+        with self._host_lock:
+            count, last_ts = self._host_failures.get(host, (0, 0))
+            ok_until = self._host_ok.get(host, 0)
+        if count >= HOST_FAILURE_LIMIT and now - last_ts < HOST_FAILURE_WINDOW:
+            logger.info(f"Host {host} falhou {count} vezes na última hora; enviando sem a foto")
+            return False
+        # Host aprovado recentemente: dispensa o HEAD e deixa o Telegram buscar direto
+        if ok_until > now:
+            return True
+        
+        try:
+            response = self._preflight_http.head(url, headers={'User-Agent': TELEGRAM_FETCHER_USER_AGENT},
+                                                 timeout=PREFLIGHT_TIMEOUT, allow_redirects=True)
+        except requests.exceptions.ConnectionError as e:
+            # Host inacessível conta como falha dele; ainda assim o próprio Telegram tenta
+            logger.warning(f"Falha no preflight da imagem {url}: {e}")
+            self._record_host_failure(url)
+            return True
+        except requests.exceptions.RequestException as e:
+            # Preflight inconclusivo: deixa o próprio Telegram tentar
+            logger.warning(f"Falha no preflight da imagem {url}: {e}")
+            return True
+        
+        if response.status_code != 200:
+            logger.warning(f"Preflight da imagem retornou {response.status_code}: {url}")
+            # 403 e 5xx indicam bloqueio ou instabilidade do host; 404 e afins são da URL
+            if response.status_code == 403 or response.status_code >= 500:
+                self._record_host_failure(url)
+            return False
+        
+        with self._host_lock:
+            self._host_ok[host] = now + HOST_OK_TTL
+        
+        size = int(response.headers.get('Content-Length') or 0)
+        if size > PHOTO_URL_MAX_BYTES:
+            logger.info(f"Imagem com {size} bytes excede o limite do sendPhoto por URL: {url}")
+            return False
+        
+        return True
+    
+    def fetch_new(self, subreddit_name: str, before: Optional[str] = None, limit: Optional[int] = None,
+                  reddit: Optional[praw.Reddit] = None) -> List:
+        """Busca os posts mais recentes de um subreddit (só os mais novos que before, se informado)"""
+        logger.info(f"Verificando r/{subreddit_name}")
+        reddit = reddit or self.reddit
+        limit = limit or self._max_posts
+        if not before:
+            return list(reddit.subreddit(subreddit_name).new(limit=limit))
+        # Requisição única: o ListingGenerator do PRAW pediria a página seguinte com before= e
+        # after= juntos e, como o Reddit dá precedência ao before=, a mesma página voltaria
+        listing = reddit.get(f"r/{subreddit_name}/new",
+                             params={'before': before, 'limit': min(limit, LISTING_MAX_LIMIT)})
+        return list(listing)
+    
+    def _fetch_new_isolated(self, subreddit_name: str, before: Optional[str] = None) -> List:
+        """Busca a listagem em uma thread de trabalho, com um cliente do PRAW só dela"""
+        try:
+            reddit = self._fetch_clients.get_nowait()
+        except queue.Empty:
+            reddit = self.setup_reddit()
+        try:
+            return self.fetch_new(subreddit_name, before, reddit=reddit)
+        finally:
+            self._fetch_clients.put(reddit)
+    
     def check_subreddits(self):
         """Verifica novos posts nos subreddits configurados"""
-        for subreddit_name in self.config['subreddits']:
+        subreddits = self._subreddits
+        if not subreddits:
+            return 0
+        new_posts = 0
+        
+        # A âncora faz o Reddit devolver só os posts novos; periodicamente uma busca completa
+        # recupera o caso em que o post âncora foi removido (a listagem viria sempre vazia).
+        # O período é medido em tempo, não em ciclos, porque o intervalo cresce a cada ciclo vazio
+        now = time.monotonic()
+        reanchor = self._last_full_fetch is None or now - self._last_full_fetch >= LAST_SEEN_REANCHOR_INTERVAL
+        if reanchor:
+            self._last_full_fetch = now
+        previous_anchors = dict(self.last_seen)
+        
+        # Uma única listagem combinada (r/a+b+c) cobre todos os subreddits em uma requisição
+        if len(subreddits) > 1:
+            merged_name = '+'.join(subreddits)
             try:
-                logger.info(f"Verificando r/{subreddit_name}")
-                subreddit = self.reddit.subreddit(subreddit_name)
-                
-                # Pega os posts mais recentes
-                for post in subreddit.new(limit=self.config.get('max_posts_per_check', 10)):
-                    if post.id not in self.processed_posts:
-                        logger.info(f"Novo post encontrado: {post.title}")
-                        
-                        # Verifica se deve enviar posts apenas com texto
-                        send_text_only = self.config.get('send_text_only_posts', False)
-                        has_media = self.has_media_content(post)
-                        
-                        # Se a configuração está desabilitada e o post só tem texto, pula
-                        if not send_text_only and not has_media:
-                            logger.info(f"Post {post.id} pulado - apenas texto e send_text_only_posts=false")
-                            self.processed_posts.add(post.id)
-                            continue
-                        
-                        # Verifica se é conteúdo NSFW
-                        is_nsfw = getattr(post, 'over_18', False)
-                        if is_nsfw:
-                            logger.info(f"Post NSFW detectado: {post.id}")
-                        
-                        # Formata a mensagem
-                        message = self.format_post_message(post)
-                        media_url = post.url if not post.is_self else None
-                        video_file_path = None
-                        
-                        # Debug: mostra informações do post
-                        logger.info(f"Post ID: {post.id}, is_self: {post.is_self}, URL: {post.url}, NSFW: {is_nsfw}")
-                        logger.info(f"Post has is_video: {hasattr(post, 'is_video')}, is_video value: {getattr(post, 'is_video', False)}")
-                        
-                        # Debug detalhado das propriedades do post
-                        logger.info(f"Post preview: {hasattr(post, 'preview')}")
-                        logger.info(f"Post media: {hasattr(post, 'media')} - {getattr(post, 'media', None)}")
-                        logger.info(f"Post media_metadata: {hasattr(post, 'media_metadata')} - {getattr(post, 'media_metadata', None)}")
-                        logger.info(f"Post crosspost_parent_list: {hasattr(post, 'crosspost_parent_list')} - {getattr(post, 'crosspost_parent_list', None)}")
-                        
-                        # Verifica todas as propriedades que podem conter vídeo
-                        if hasattr(post, 'preview') and post.preview:
-                            logger.info(f"Post preview: {post.preview}")
-                        if hasattr(post, 'media_metadata') and post.media_metadata:
-                            logger.info(f"Post media_metadata: {post.media_metadata}")
-                        if hasattr(post, 'crosspost_parent_list') and post.crosspost_parent_list:
-                            logger.info(f"Post crosspost_parent_list: {post.crosspost_parent_list}")
-                        
-                        # Tenta baixar vídeo do Reddit (direto ou incorporado em post de texto)
-                        logger.info(f"Tentando baixar vídeo do Reddit para post {post.id}")
-                        video_file_path = self.download_reddit_video(post)
-                        if video_file_path:
-                            logger.info(f"Vídeo baixado com sucesso: {video_file_path}")
-                            media_url = None  # Usa arquivo local ao invés da URL
-                        else:
-                            logger.info(f"Nenhum vídeo encontrado para o post {post.id}")
-                            
-                            # Se não encontrou vídeo, tenta baixar imagem (especialmente para posts NSFW)
-                            if is_nsfw or not post.is_self:
-                                logger.info(f"Tentando extrair URL de imagem para post {post.id}")
-                                image_url = self.download_reddit_image(post)
-                                if image_url:
-                                    logger.info(f"URL da imagem extraída com sucesso: {image_url}")
-                                    media_url = image_url
-                                else:
-                                    logger.info(f"Nenhuma imagem encontrada para o post {post.id}")
-                        
-                        # Envia a mensagem
-                        post_url = f"https://reddit.com{post.permalink}"
-                        success = self.send_telegram_message(message, media_url, video_file_path, post_url, is_nsfw)
-                        
-                        # Limpa arquivo temporário se foi criado
-                        if video_file_path:
-                            self.cleanup_temp_file(video_file_path)
-                        
-                        if success:
-                            self.processed_posts.add(post.id)
-                            # Pequena pausa entre envios
-                            time.sleep(2)
-                        
-                        # Limita o número de posts processados por verificação
-                        if len(self.processed_posts) % 5 == 0:
-                            self.save_processed_posts()
-                            
+                posts = self.fetch_new(merged_name, None if reanchor else self.last_seen.get(merged_name),
+                                       limit=self._max_posts * len(subreddits))
+            except Exception as e:
+                logger.warning(f"Erro na listagem combinada ({e}); verificando os subreddits separadamente")
+            else:
+                try:
+                    new_posts = self._process_listing(merged_name, posts)
+                    self._update_subreddit_anchors(posts)
+                except Exception as e:
+                    logger.error(f"Erro ao verificar r/{merged_name}: {e}")
+                if self.last_seen != previous_anchors:
+                    self.save_last_seen()
+                return new_posts
+        
+        # Busca as listagens de todos os subreddits em paralelo e processa cada uma assim que
+        # chega, enquanto as demais ainda estão em andamento
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(subreddits))) as executor:
+            futures = {
+                executor.submit(self._fetch_new_isolated, name, None if reanchor else self.last_seen.get(name)): name
+                for name in subreddits
+            }
+            
+            for future in as_completed(futures):
+                subreddit_name = futures[future]
+                try:
+                    new_posts += self._process_listing(subreddit_name, future.result())
+                except Exception as e:
+                    logger.error(f"Erro ao verificar r/{subreddit_name}: {e}")
+                    continue
+        
+        if self.last_seen != previous_anchors:
+            self.save_last_seen()
+        return new_posts
+    
+    def _process_listing(self, name: str, posts: List) -> int:
+        """Processa uma listagem e avança a âncora dela; devolve quantos posts eram novos"""
+        # A listagem vem do mais novo para o mais antigo; envia em ordem cronológica
+        # Um dict por post.id descarta repetições da listagem mantendo a ordem
+        pending = list({post.id: post for post in reversed(posts) if not self.is_processed(post.id)}.values())
+        self.process_posts(pending)
+        self._advance_anchor(name, posts)
+        return len(pending)
+    
+    def _advance_anchor(self, name: str, posts: List):
+        """Avança a âncora até o post mais novo anterior ao primeiro que não foi enviado"""
+        # Posts que falharam continuam depois da âncora e voltam na próxima verificação
+        for post in reversed(posts):
+            if not self.is_processed(post.id):
+                break
+            self.last_seen[name] = post.fullname
+    
+    def _update_subreddit_anchors(self, posts: List):
+        """Atualiza as âncoras individuais a partir da listagem combinada (usadas no fallback)"""
+        names = {name.lower(): name for name in self._subreddits}
+        by_subreddit = {}
+        for post in posts:
+            name = names.get(post.subreddit.display_name.lower())
+            if name:
+                by_subreddit.setdefault(name, []).append(post)
+        for name, subreddit_posts in by_subreddit.items():
+            self._advance_anchor(name, subreddit_posts)
+    
+    def next_interval(self, new_posts: int) -> float:
+        """Ajusta o intervalo conforme a atividade do último ciclo e devolve a espera (com jitter)"""
+        if new_posts:
+            self.current_interval = max(self._min_interval, self.current_interval // 2)
+        else:
+            self.current_interval = min(self._max_interval, int(self.current_interval * INTERVAL_BACKOFF_FACTOR))
+        return self.current_interval + random.uniform(0, INTERVAL_JITTER * self.current_interval)
+    
+    def process_post(self, post):
+        """Processa um post: filtra, baixa a mídia e envia para o Telegram"""
+        if self.is_processed(post.id):
+            return
+        self.send_prepared_post(self.prepare_post(post))
+    
+    def process_posts(self, posts: List):
+        """Processa os posts em ordem, baixando a mídia do próximo enquanto o atual é enviado"""
+        if not posts:
+            return
+        # Um único worker: os downloads ficam um post à frente dos envios, sem competir entre si
+        with ThreadPoolExecutor(max_workers=1) as downloader:
+            next_prepared = downloader.submit(self.prepare_post, posts[0])
+            for i, post in enumerate(posts):
+                prepared = next_prepared
+                if i + 1 < len(posts):
+                    next_prepared = downloader.submit(self.prepare_post, posts[i + 1])
+                try:
+                    self.send_prepared_post(prepared.result())
+                except Exception as e:
+                    logger.error(f"Erro ao processar post {post.id}: {e}")
+    
+    def prepare_post(self, post) -> PreparedPost:
+        """Analisa o post, monta a mensagem e baixa a mídia que será enviada"""
+        # Atributos usados várias vezes lidos uma única vez do objeto do PRAW
+        post_id, url, is_self = post.id, post.url, post.is_self
+        raw = vars(post)  # Campos opcionais sem disparar o carregamento preguiçoso do PRAW
+        post_url = "https://reddit.com" + post.permalink
+        logger.info(f"Novo post encontrado: {post.title}")
+        
+        # Verifica se deve enviar posts apenas com texto
+        media = self._analyze_media(post)
+        has_media = media.kind != 'none'
+        
+        # Se a configuração está desabilitada e o post só tem texto, pula
+        if not self._send_text_only and not has_media:
+            logger.info(f"Post {post_id} pulado - apenas texto e send_text_only_posts=false")
+            return PreparedPost(post, skip=True)
+        
+        # Verifica se é conteúdo NSFW
+        is_nsfw = raw.get('over_18', False)
+        if is_nsfw:
+            logger.info(f"Post NSFW detectado: {post_id}")
+        
+        # Formata a mensagem
+        message = self.format_post_message(post)
+        media_url = url if not is_self else None
+        media_group = None
+        video_file_path = None
+        
+        # Debug: propriedades do post que determinam a mídia (só montado com LOG_LEVEL=DEBUG)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "post=%s is_self=%s url=%s nsfw=%s is_video=%s media_kind=%s "
+                "preview=%s media=%s media_metadata=%s crosspost_parent_list=%s",
+                post_id, is_self, url, is_nsfw, raw.get('is_video', False), media.kind,
+                raw.get('preview'), raw.get('media'),
+                raw.get('media_metadata'), raw.get('crosspost_parent_list')
+            )
+        
+        # MP4 direto (sem playlist HLS/DASH para juntar): o Telegram pode buscar pela URL e o
+        # download local fica como fallback no envio
+        video_url = media.video_url
+        if (self._prefer_url_passthrough and video_url
+                and not any(format_type in video_url for format_type in ['HLSPlaylist.m3u8', 'DASHPlaylist.mpd'])):
+            logger.info(f"Vídeo MP4 será enviado pela URL: {video_url}")
+            return PreparedPost(post, message, None, None, post_url, is_nsfw, video_url=video_url)
+        
+        # Tenta baixar vídeo do Reddit (direto ou incorporado em post de texto)
+        logger.info(f"Tentando baixar vídeo do Reddit para post {post_id}")
+        video_file_path = self.download_reddit_video(post, media)
+        if video_file_path:
+            logger.info(f"Vídeo baixado com sucesso: {video_file_path}")
+            media_url = None  # Usa arquivo local ao invés da URL
+        else:
+            logger.info(f"Nenhum vídeo encontrado para o post {post_id}")
+            
+            # Se não encontrou vídeo, tenta baixar imagem (especialmente para posts NSFW)
+            if is_nsfw or not is_self:
+                logger.info(f"Tentando extrair URL de imagem para post {post_id}")
+                image_urls = self.download_reddit_image(post, media)
+                if image_urls:
+                    logger.info(f"URL da imagem extraída com sucesso: {image_urls[0]}")
+                    media_url = image_urls[0]
+                    media_group = image_urls
+                else:
+                    logger.info(f"Nenhuma imagem encontrada para o post {post_id}")
+        
+        return PreparedPost(post, message, media_url, video_file_path, post_url, is_nsfw, media_group)
+    
+    def send_prepared_post(self, prepared: PreparedPost):
+        """Envia um post preparado e o marca como processado se der certo"""
+        # O mesmo post pode ter sido enviado depois que a lista de pendentes foi montada
+        if self.is_processed(prepared.post.id):
+            self.cleanup_temp_file(prepared.video_file_path)
+            return
+        if prepared.skip:
+            self.mark_processed(prepared.post.id)
+            return
+        
+        if prepared.video_url:
+            try:
+                self.send_telegram_video_url(prepared.video_url, prepared.message)
+                logger.info("Vídeo enviado pela URL com sucesso para o Telegram")
+                self.mark_processed(prepared.post.id)
+                return
+            except requests.exceptions.RequestException as e:
+                # Ex.: CDN recusou o fetcher do Telegram ou o vídeo passa do limite por URL
+                logger.warning(f"Telegram não aceitou o vídeo pela URL: {e}. Baixando o arquivo")
+            try:
+                prepared.video_file_path = self.download_mp4(prepared.video_url)
             except Exception as e:
-                logger.error(f"Erro ao verificar r/{subreddit_name}: {e}")
-                continue
+                logger.error(f"Erro ao baixar vídeo do Reddit: {e}")
+        
+        try:
+            success = self.send_telegram_message(
+                prepared.message, prepared.media_url, prepared.video_file_path,
+                prepared.post_url, prepared.is_nsfw, prepared.media_group
+            )
+        finally:
+            # Limpa arquivo temporário se foi criado
+            if prepared.video_file_path:
+                self.cleanup_temp_file(prepared.video_file_path)
+        
+        # O espaçamento entre envios fica por conta dos rate limiters do _post_telegram
+        if success:
+            self.mark_processed(prepared.post.id)
     
     def run(self):
         """Executa o bot em loop contínuo"""
@@ -758,29 +1457,71 @@ class RedditToTelegramBot:
         logger.info(f"Intervalo de verificação: {self.config['check_interval']} segundos")
         
         try:
+            if self.config.get('stream_mode', False):
+                self.run_stream()
+                return
+            
             while True:
-                self.check_subreddits()
+                new_posts = self.check_subreddits()
                 self.save_processed_posts()
                 
-                # Tenta reenviar mensagens falhadas a cada processamento
-                self.retry_failed_messages()
-                
-                logger.info(f"Aguardando {self.config['check_interval']} segundos...")
-                time.sleep(self.config['check_interval'])
+                interval = self.next_interval(new_posts)
+                logger.info(f"{new_posts} posts novos. Aguardando {interval:.0f} segundos...")
+                time.sleep(interval)
                 
         except KeyboardInterrupt:
             logger.info("Bot interrompido pelo usuário")
-            self.save_processed_posts()
+            self.close()
         except Exception as e:
             logger.error(f"Erro inesperado: {e}")
-            self.save_processed_posts()
+            self.close()
             raise
 
+    def run_stream(self):
+        """Monitora os subreddits via stream do PRAW, recebendo apenas posts ainda não vistos"""
+        logger.info("Modo stream ativado")
+        subreddit = self.reddit.subreddit('+'.join(self._subreddits))
+        last_maintenance = time.monotonic()
+        delay = STREAM_RETRY_BASE_DELAY
+        # A primeira consulta do stream traz até 100 posts da listagem combinada, bem mais que
+        # os max_posts_per_check do modo por intervalo: só entram os publicados depois que o
+        # stream começou. Nas reconexões o limite continua o mesmo, e os posts publicados
+        # durante o backoff são recuperados (processed_posts evita duplicatas)
+        started_at = time.time() - 60  # margem para o relógio local adiantado em relação ao Reddit
+        
+        # O gerador do PRAW termina na primeira exceção: erros do Reddit recriam o stream
+        # depois de um backoff, e só o KeyboardInterrupt (fora de Exception) encerra o bot
+        while True:
+            try:
+                # pause_after=0 devolve None sempre que uma consulta não traz posts novos
+                for post in subreddit.stream.submissions(pause_after=0):
+                    delay = STREAM_RETRY_BASE_DELAY
+                    if post is not None and post.created_utc >= started_at:
+                        try:
+                            self.process_post(post)
+                        except Exception as e:
+                            logger.error(f"Erro ao processar post {post.id}: {e}")
+                    
+                    # Salva o estado no mesmo ritmo do modo por intervalo
+                    if time.monotonic() - last_maintenance >= self._check_interval:
+                        self.save_processed_posts()
+                        last_maintenance = time.monotonic()
+            except Exception as e:
+                logger.warning(f"Erro no stream do Reddit: {e}. Reconectando em {delay}s")
+                self.save_processed_posts()
+                time.sleep(delay)
+                delay = min(delay * 2, STREAM_RETRY_MAX_DELAY)
+
 def main():
     """Função principal"""
     try:
-        bot = RedditToTelegramBot()
-        bot.run()
+        with RedditToTelegramBot() as bot:
+            if '--health-check' in sys.argv[1:]:
+                return 0 if bot.health_check() else 1
+            # kill -HUP <pid> recarrega o config.json (sinal inexistente no Windows)
+            if hasattr(signal, 'SIGHUP'):
+                signal.signal(signal.SIGHUP, bot.reload_config)
+            bot.run()
     except Exception as e:
         logger.error(f"Erro ao inicializar bot: {e}")
         return 1
@@ -8,22 +8,12 @@ Inclui funcionalidades de restart automático e gerenciamento de erros
 import os
 import sys
 import time
+import threading
 import signal
 import logging
 from datetime import datetime
-from reddit_to_telegram import RedditToTelegramBot
-
-# Configuração de encoding UTF-8 para Windows
-if sys.platform == 'win32':
-    import os
-    # Configura variáveis de ambiente para UTF-8
-    os.environ['PYTHONIOENCODING'] = 'utf-8'
-    # Tenta configurar o console para UTF-8 se possível
-    try:
-        import locale
-        locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
-    except:
-        pass
+# Importar reddit_to_telegram também deixa o console do Windows em UTF-8
+from reddit_to_telegram import RedditToTelegramBot, read_json_file
 
 # Configuração de logging para o serviço
 logging.basicConfig(
@@ -39,7 +29,8 @@ logger = logging.getLogger('RedditTelegramService')
 class RedditTelegramService:
     def __init__(self):
         self.bot = None
-        self.running = True
+        # Sinalizado para parar o serviço; as esperas acordam na hora em vez de a cada segundo
+        self.stop_event = threading.Event()
         self.restart_count = 0
         self.max_restarts = 10
         self.restart_delay = 60  # segundos
@@ -47,11 +38,35 @@ class RedditTelegramService:
         # Configura handlers para sinais do sistema
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
+        # kill -HUP <pid> recarrega o config.json sem reiniciar (sinal inexistente no Windows)
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, self.reload_handler)
     
     def signal_handler(self, signum, frame):
         """Handler para sinais do sistema (Ctrl+C, etc.)"""
         logger.info(f"Sinal {signum} recebido. Parando o serviço...")
-        self.running = False
+        self.stop_event.set()
+    
+    @property
+    def running(self) -> bool:
+        """Indica se o serviço ainda deve continuar executando"""
+        return not self.stop_event.is_set()
+    
+    def wait(self, seconds: float):
+        """Espera até seconds segundos, retornando antes se o serviço for parado"""
+        # No Windows a espera em Event não é interrompida pelo Ctrl+C: acorda a cada segundo
+        step = 1 if sys.platform == 'win32' else None
+        deadline = time.monotonic() + seconds
+        while not self.stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self.stop_event.wait(remaining if step is None else min(step, remaining))
+    
+    def reload_handler(self, signum, frame):
+        """Handler do SIGHUP: recarrega a configuração do bot em execução"""
+        if self.bot:
+            self.bot.reload_config()
     
     def initialize_bot(self):
         """Inicializa o bot com tratamento de erros"""
@@ -67,6 +82,15 @@ class RedditTelegramService:
             logger.error(f"Erro ao inicializar bot: {e}")
             return False
     
+    def discard_bot(self):
+        """Fecha o bot atual (gravando o estado pendente) para forçar reinicialização"""
+        if self.bot:
+            try:
+                self.bot.close()
+            except Exception as e:
+                logger.error(f"Erro ao fechar bot: {e}")
+        self.bot = None
+    
     def run_bot_cycle(self):
         """Executa um ciclo do bot com tratamento de erros"""
         try:
@@ -75,28 +99,21 @@ class RedditTelegramService:
                     return False
             
             # Executa uma verificação
-            self.bot.check_subreddits()
+            new_posts = self.bot.check_subreddits()
             self.bot.save_processed_posts()
             
-            # Aguarda o intervalo configurado
-            interval = self.bot.config.get('check_interval', 300)
-            logger.info(f"Ciclo concluído. Aguardando {interval} segundos...")
+            # Aguarda o intervalo, ajustado conforme a atividade dos subreddits
+            interval = self.bot.next_interval(new_posts)
+            logger.info(f"Ciclo concluído ({new_posts} posts novos). Aguardando {interval:.0f} segundos...")
             
-            # Aguarda com verificação periódica do status
-            for _ in range(interval):
-                if not self.running:
-                    break
-                time.sleep(1)
+            self.wait(interval)
             
             return True
             
         except KeyboardInterrupt:
             logger.info("Interrupção pelo usuário")
-            self.running = False
+            self.stop_event.set()
             return False
-        except UnicodeEncodeError as e:
-            logger.error(f"Erro de codificação Unicode: {e}")
-            return True  # Continua executando apesar do erro de encoding
         except Exception as e:
             logger.error(f"Erro no ciclo do bot: {e}")
             return False
@@ -120,7 +137,7 @@ class RedditTelegramService:
                 if not self.bot:
                     if not self.initialize_bot():
                         logger.error("Falha na inicialização. Tentando novamente em 30 segundos...")
-                        time.sleep(30)
+                        self.wait(30)
                         continue
                 
                 # Executa o bot
@@ -136,24 +153,20 @@ class RedditTelegramService:
                     
                     if self.restart_count < self.max_restarts:
                         logger.info(f"Reiniciando em {self.restart_delay} segundos...")
-                        time.sleep(self.restart_delay)
-                        self.bot = None  # Força reinicialização
+                        self.wait(self.restart_delay)
+                        self.discard_bot()  # Força reinicialização
                     else:
                         logger.error("Número máximo de restarts atingido. Parando o serviço.")
                         break
                 
-            except UnicodeEncodeError as e:
-                logger.error(f"Erro de codificação Unicode no serviço: {e}")
-                # Não conta como restart para erros de encoding
-                continue
             except Exception as e:
                 logger.error(f"Erro crítico no serviço: {e}")
                 self.restart_count += 1
                 
                 if self.restart_count < self.max_restarts:
                     logger.info(f"Tentando restart em {self.restart_delay} segundos...")
-                    time.sleep(self.restart_delay)
-                    self.bot = None
+                    self.wait(self.restart_delay)
+                    self.discard_bot()
                 else:
                     logger.error("Muitos erros consecutivos. Parando o serviço.")
                     break
@@ -161,8 +174,7 @@ class RedditTelegramService:
         # Salva posts processados e mensagens falhadas antes de finalizar
         if self.bot:
             try:
-                self.bot.save_processed_posts()
-                self.bot.save_failed_messages()
+                self.bot.close()
                 logger.info("Posts processados e mensagens falhadas salvos com sucesso")
             except Exception as e:
                 logger.error(f"Erro ao salvar posts processados e mensagens falhadas: {e}")
@@ -171,6 +183,31 @@ class RedditTelegramService:
         logger.info(f"Total de restarts: {self.restart_count}")
         logger.info(f"Hora de término: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
 
+# Bytes lidos do final dos logs no status (evita carregar arquivos de centenas de MB)
+LOG_TAIL_BYTES = 4096
+
+def read_log_tail(path: str):
+    """Lê só o final do log e devolve (última linha, total de linhas, se o total é estimado)"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        f.seek(max(0, size - LOG_TAIL_BYTES))
+        tail = f.read()
+    
+    lines = tail.split(b'\n')
+    estimated = size > LOG_TAIL_BYTES
+    if estimated and len(lines) > 1:
+        lines = lines[1:]  # A primeira linha do bloco provavelmente está cortada
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return None, 0, False
+    
+    last_line = lines[-1].decode('utf-8', errors='replace').strip()
+    if not estimated:
+        return last_line, len(lines), False
+    # Estima o total pelo tamanho médio das linhas do final do arquivo
+    average = sum(len(line) + 1 for line in lines) / len(lines)
+    return last_line, int(size / average), True
+
 def show_status():
     """Mostra informações de status do serviço"""
     print("Reddit to Telegram Service - Status")
@@ -183,28 +220,31 @@ def show_status():
         print("❌ Arquivo de configuração: NÃO ENCONTRADO")
         print("   Execute: python setup_and_test.py")
     
-    # Verifica logs recentes
-    if os.path.exists('service.log'):
-        print("✅ Arquivo de log: OK")
-        try:
-            with open('service.log', 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                if lines:
-                    print(f"   Última entrada: {lines[-1].strip()}")
-                    print(f"   Total de linhas: {len(lines)}")
-        except Exception as e:
-            print(f"   Erro ao ler log: {e}")
-    else:
-        print("⚠️  Arquivo de log: NÃO ENCONTRADO")
+    # Verifica logs recentes (do serviço e do bot)
+    for log_file in ('service.log', 'reddit_bot.log'):
+        if os.path.exists(log_file):
+            print(f"✅ Arquivo de log {log_file}: OK")
+            try:
+                last_line, total, estimated = read_log_tail(log_file)
+                if last_line:
+                    print(f"   Última entrada: {last_line}")
+                    print(f"   Total de linhas: {'~' if estimated else ''}{total}")
+            except Exception as e:
+                print(f"   Erro ao ler log: {e}")
+        else:
+            print(f"⚠️  Arquivo de log {log_file}: NÃO ENCONTRADO")
     
-    # Verifica posts processados
-    if os.path.exists('processed_posts.json'):
+    # Verifica posts processados (snapshot JSON + log de IDs ainda não compactados)
+    if os.path.exists('processed_posts.json') or os.path.exists('processed_posts.log'):
         print("✅ Histórico de posts: OK")
         try:
-            import json
-            with open('processed_posts.json', 'r', encoding='utf-8') as f:
-                posts = json.load(f)
-                print(f"   Posts processados: {len(posts)}")
+            total = 0
+            if os.path.exists('processed_posts.json'):
+                total += len(read_json_file('processed_posts.json'))
+            if os.path.exists('processed_posts.log'):
+                with open('processed_posts.log', 'r', encoding='utf-8') as f:
+                    total += sum(1 for line in f if line.strip())
+            print(f"   Posts processados: {total}")
         except Exception as e:
             print(f"   Erro ao ler histórico: {e}")
     else:
@@ -213,32 +253,17 @@ def show_status():
     # Verifica mensagens falhadas
     if os.path.exists('failed_messages.json'):
         try:
-            import json
-            with open('failed_messages.json', 'r', encoding='utf-8') as f:
-                failed_messages = json.load(f)
-                print(f"⚠️ Mensagens falhadas pendentes: {len(failed_messages)}")
-                if failed_messages:
-                    for i, msg in enumerate(failed_messages[:3]):  # Mostra apenas as 3 primeiras
-                        print(f"   {i+1}. Tentativas: {msg.get('retry_count', 0)}/3 - {msg.get('timestamp', 'N/A')}")
-                    if len(failed_messages) > 3:
-                        print(f"   ... e mais {len(failed_messages) - 3} mensagens")
+            failed_messages = read_json_file('failed_messages.json')
+            print(f"⚠️ Mensagens falhadas pendentes: {len(failed_messages)}")
+            if failed_messages:
+                for i, msg in enumerate(failed_messages[:3]):  # Mostra apenas as 3 primeiras
+                    print(f"   {i+1}. Tentativas: {msg.get('retry_count', 0)}/3 - {msg.get('timestamp', 'N/A')}")
+                if len(failed_messages) > 3:
+                    print(f"   ... e mais {len(failed_messages) - 3} mensagens")
         except Exception as e:
             print(f"❌ Erro ao ler mensagens falhadas: {e}")
     else:
         print("✅ Nenhuma mensagem falhada pendente")
-    
-    # Verifica log do bot principal
-    if os.path.exists('reddit_bot.log'):
-        print("✅ Log do bot: OK")
-        try:
-            with open('reddit_bot.log', 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                if lines:
-                    print(f"   Última atividade: {lines[-1].strip()}")
-        except Exception as e:
-            print(f"   Erro ao ler log do bot: {e}")
-    else:
-        print("⚠️  Log do bot: NÃO ENCONTRADO")
 
 def main():
     """Função principal"""
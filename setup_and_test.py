@@ -8,8 +8,18 @@ Ajuda a configurar e testar as credenciais antes de executar o bot principal
 import json
 import praw
 import requests
+import threading
+import time
 from datetime import datetime
 
+# Subreddits consultados em paralelo no teste de acesso
+MAX_PROBE_WORKERS = 16
+# Prazo único para o conjunto dos testes de conectividade, que rodam em paralelo
+TESTS_TIMEOUT = 30  # segundos
+
+# Cliente do PRAW de cada thread de teste (o PRAW não é thread-safe)
+_thread_local = threading.local()
+
 def create_config():
     """Cria arquivo de configuração interativamente"""
     print("=== Configuração do Reddit to Telegram Bot ===")
@@ -83,9 +93,9 @@ def create_config():
     print("\n✅ Arquivo config.json criado com sucesso!")
     return config
 
-def test_reddit_connection(config):
+def test_reddit_connection(config, out=print):
     """Testa a conexão com o Reddit"""
-    print("\n=== Testando conexão com Reddit ===")
+    out("\n=== Testando conexão com Reddit ===")
     
     try:
         reddit = praw.Reddit(
@@ -99,21 +109,21 @@ def test_reddit_connection(config):
         posts = list(test_subreddit.hot(limit=1))
         
         if posts:
-            print(f"✅ Conexão com Reddit OK!")
-            print(f"   Teste realizado com r/python")
-            print(f"   Post de teste: {posts[0].title[:50]}...")
+            out(f"✅ Conexão com Reddit OK!")
+            out(f"   Teste realizado com r/python")
+            out(f"   Post de teste: {posts[0].title[:50]}...")
             return True
         else:
-            print("❌ Não foi possível obter posts do Reddit")
+            out("❌ Não foi possível obter posts do Reddit")
             return False
             
     except Exception as e:
-        print(f"❌ Erro na conexão com Reddit: {e}")
+        out(f"❌ Erro na conexão com Reddit: {e}")
         return False
 
-def test_telegram_connection(config):
+def test_telegram_connection(config, out=print):
     """Testa a conexão com o Telegram"""
-    print("\n=== Testando conexão com Telegram ===")
+    out("\n=== Testando conexão com Telegram ===")
     
     try:
         bot_token = config['telegram']['bot_token']
@@ -134,53 +144,106 @@ def test_telegram_connection(config):
         
         result = response.json()
         if result.get('ok'):
-            print("✅ Conexão com Telegram OK!")
-            print(f"   Mensagem de teste enviada com sucesso")
-            print(f"   Message ID: {result['result']['message_id']}")
+            out("✅ Conexão com Telegram OK!")
+            out(f"   Mensagem de teste enviada com sucesso")
+            out(f"   Message ID: {result['result']['message_id']}")
             return True
         else:
-            print(f"❌ Erro na resposta do Telegram: {result}")
+            out(f"❌ Erro na resposta do Telegram: {result}")
             return False
             
     except requests.exceptions.RequestException as e:
-        print(f"❌ Erro de conexão com Telegram: {e}")
+        out(f"❌ Erro de conexão com Telegram: {e}")
         return False
     except Exception as e:
-        print(f"❌ Erro inesperado no Telegram: {e}")
+        out(f"❌ Erro inesperado no Telegram: {e}")
         return False
 
-def test_subreddits(config):
-    """Testa o acesso aos subreddits configurados"""
-    print("\n=== Testando acesso aos subreddits ===")
-    
-    try:
-        reddit = praw.Reddit(
+def _thread_reddit(config):
+    """Retorna o cliente do PRAW da thread atual, criando-o na primeira chamada"""
+    reddit = getattr(_thread_local, 'reddit', None)
+    if reddit is None:
+        reddit = _thread_local.reddit = praw.Reddit(
             client_id=config['reddit']['client_id'],
             client_secret=config['reddit']['client_secret'],
             user_agent=config['reddit']['user_agent']
         )
+    return reddit
+
+def _probe(config, subreddit_name):
+    """Busca o post mais recente do subreddit; retorna (ok, título ou erro)"""
+    try:
+        posts = list(_thread_reddit(config).subreddit(subreddit_name).new(limit=1))
+        return True, posts[0].title if posts else None
+    except Exception as e:
+        return False, e
+
+def test_subreddits(config, out=print):
+    """Testa o acesso aos subreddits configurados"""
+    out("\n=== Testando acesso aos subreddits ===")
+    
+    try:
+        subreddits = config['subreddits']
+        if not subreddits:
+            return True
+        
+        # Consulta todos os subreddits em paralelo, cada thread com a sua instância do PRAW;
+        # threads daemon pelo mesmo motivo de run_tests
+        workers = min(MAX_PROBE_WORKERS, len(subreddits))
+        results = [None] * len(subreddits)
+        
+        def probe_slice(start):
+            for i in range(start, len(subreddits), workers):
+                results[i] = _probe(config, subreddits[i])
+        
+        threads = [threading.Thread(target=probe_slice, args=(k,), daemon=True) for k in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
         
         all_ok = True
-        for subreddit_name in config['subreddits']:
-            try:
-                subreddit = reddit.subreddit(subreddit_name)
-                posts = list(subreddit.new(limit=1))
-                
-                if posts:
-                    print(f"✅ r/{subreddit_name} - OK ({posts[0].title[:30]}...)")
-                else:
-                    print(f"⚠️  r/{subreddit_name} - Sem posts recentes")
-                    
-            except Exception as e:
-                print(f"❌ r/{subreddit_name} - Erro: {e}")
+        for subreddit_name, (ok, detail) in zip(subreddits, results):
+            if not ok:
+                out(f"❌ r/{subreddit_name} - Erro: {detail}")
                 all_ok = False
+            elif detail is not None:
+                out(f"✅ r/{subreddit_name} - OK ({detail[:30]}...)")
+            else:
+                out(f"⚠️  r/{subreddit_name} - Sem posts recentes")
         
         return all_ok
         
     except Exception as e:
-        print(f"❌ Erro geral ao testar subreddits: {e}")
+        out(f"❌ Erro geral ao testar subreddits: {e}")
         return False
 
+def run_tests(config):
+    """Executa os testes de conectividade em paralelo; a saída de cada um é impressa em ordem"""
+    tests = (test_reddit_connection, test_telegram_connection, test_subreddits)
+    outputs = [[] for _ in tests]
+    results = [None] * len(tests)
+    
+    def run_one(index, test):
+        results[index] = test(config, outputs[index].append)
+    
+    # Threads daemon: um teste travado não segura o script depois do prazo (as threads do
+    # ThreadPoolExecutor são aguardadas na saída do interpretador)
+    threads = [threading.Thread(target=run_one, args=(i, test), daemon=True) for i, test in enumerate(tests)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + TESTS_TIMEOUT
+    for thread in threads:
+        thread.join(max(0, deadline - time.monotonic()))
+    
+    for i, (test, thread) in enumerate(zip(tests, threads)):
+        for line in list(outputs[i]):
+            print(line)
+        if thread.is_alive():
+            print(f"❌ Tempo esgotado ({TESTS_TIMEOUT}s) em {test.__name__}")
+            results[i] = False
+    return results
+
 def main():
     """Função principal do script de configuração"""
     print("Reddit to Telegram Bot - Setup e Teste")
@@ -203,9 +266,7 @@ def main():
     print("\n" + "=" * 40)
     print("Executando testes de conectividade...")
     
-    reddit_ok = test_reddit_connection(config)
-    telegram_ok = test_telegram_connection(config)
-    subreddits_ok = test_subreddits(config)
+    reddit_ok, telegram_ok, subreddits_ok = run_tests(config)
     
     # Resumo final
     print("\n" + "=" * 40)
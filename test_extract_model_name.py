@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da extração do nome da modelo a partir do título do post
+Compara extract_model_name com a implementação original nos casos de borda
+"""
+
+import re
+import unittest
+
+from reddit_to_telegram import RedditToTelegramBot
+
+def original_extract_model_name(title: str) -> str:
+    """Implementação original (re.search + re.sub + split), usada como referência"""
+    match = re.search(r'^([^|]+)\s*\|', title)
+    if match:
+        potential_name = match.group(1).strip()
+        clean_name = re.sub(r'[0-9@#$%^&*()_+=\[\]{};\'": ,.<>?/~`]', '', potential_name)
+        words = clean_name.split()
+        has_proper_name = any(word[0].isupper() and len(word) > 1 for word in words if word)
+        if has_proper_name:
+            return potential_name
+    return None
+
+class ExtractModelNameTest(unittest.TestCase):
+    def setUp(self):
+        # extract_model_name não depende do estado do bot: dispensa config e conexões
+        self.bot = RedditToTelegramBot.__new__(RedditToTelegramBot)
+    
+    def test_expected_names(self):
+        cases = {
+            'Maria Silva | fotos novas': 'Maria Silva',
+            '  Ana   | x': 'Ana',
+            'Ana | parte 1 | parte 2': 'Ana',
+            'Émilie | x': 'Émilie',
+            'Анна | x': 'Анна',
+            'JUST A NUMBER | x': 'JUST A NUMBER',
+            'A b | x': 'A b',  # sem espaços vira "Ab"
+            'jo\tMaria | x': 'jo\tMaria',  # "Maria" é a palavra com maiúscula
+        }
+        for title, expected in cases.items():
+            with self.subTest(title=title):
+                self.assertEqual(self.bot.extract_model_name(title), expected)
+    
+    def test_rejected_titles(self):
+        cases = [
+            'maria | x',        # sem maiúscula
+            'A | x',            # uma letra só
+            '123 | x',          # só número
+            '12 34 | x',
+            '@#$ | x',
+            '| x',
+            '   | x',
+            'Sem separador',
+            'A\tb | x',         # tab separa as palavras: "A" e "b"
+            'A\xa0b | x',       # NBSP também separa
+            '1A | x',           # sobra só "A"
+        ]
+        for title in cases:
+            with self.subTest(title=title):
+                self.assertIsNone(self.bot.extract_model_name(title))
+    
+    def test_matches_original(self):
+        titles = [
+            'Maria Silva | fotos', 'maria silva | fotos', 'JUST A NUMBER | x', '2024 | x',
+            'A | x', 'A b | x', 'A\tb | x', 'A\xa0b | x', 'jo\tMaria | x', 'jo\xa0Maria | x',
+            'A\nb | x', '_Ana_ | x', 'Ana* | x', '(B)(c) | x', '!Ana | x', 'É | x',
+            'ÉÁ | x', 'ß | x', 'ǅa | x', 'a B c | x', 'Ana', '', '|', ' | ', 'Ana |',
+            'Ana\t| x', 'x\tY1 | x', 'x\tY. | x', '1\t2\tAB | x',
+        ]
+        for title in titles:
+            with self.subTest(title=title):
+                self.assertEqual(self.bot.extract_model_name(title), original_extract_model_name(title))
+
+if __name__ == '__main__':
+    unittest.main()